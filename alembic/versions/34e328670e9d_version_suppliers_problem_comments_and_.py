@@ -0,0 +1,46 @@
+"""Version suppliers problem comments and attendances
+
+Revision ID: 34e328670e9d
+Revises: 77987f66c627
+Create Date: 2026-10-18 08:18:49.031654
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '34e328670e9d'
+down_revision: Union[str, None] = '77987f66c627'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables behind the remaining conditional GETs; table_versions_bump() comes from 77987f66c627
+VERSIONED_TABLES = ["suppliers", "problem_comments", "attendances"]
+
+
+def upgrade() -> None:
+    table_versions = sa.table(
+        "table_versions",
+        sa.column("table_name", sa.String),
+        sa.column("version", sa.BigInteger),
+    )
+    op.bulk_insert(table_versions, [{"table_name": table, "version": 0} for table in VERSIONED_TABLES])
+    for table in VERSIONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_table_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION table_versions_bump()"
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_table_version ON {table}")
+    op.execute(
+        sa.text("DELETE FROM table_versions WHERE table_name = ANY(:tables)")
+        .bindparams(tables=VERSIONED_TABLES)
+    )
+
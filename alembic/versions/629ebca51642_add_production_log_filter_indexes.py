@@ -0,0 +1,34 @@
+"""Add production log filter indexes
+
+Revision ID: 629ebca51642
+Revises: 16830df1eba1
+Create Date: 2026-10-18 09:12:40.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '629ebca51642'
+down_revision: Union[str, None] = '16830df1eba1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_production_logs_created_at_id', 'production_logs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_production_logs_shift_id_created_at', 'production_logs', ['shift_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_production_logs_worker_id_created_at', 'production_logs', ['worker_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_production_logs_position_id_sub_position_id_created_at', 'production_logs', ['position_id', 'sub_position_id', 'created_at'], unique=False)
+    op.create_index('ix_production_logs_item_id_created_at', 'production_logs', ['item_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_production_logs_item_id_created_at', table_name='production_logs')
+    op.drop_index('ix_production_logs_position_id_sub_position_id_created_at', table_name='production_logs')
+    op.drop_index('ix_production_logs_worker_id_created_at', table_name='production_logs')
+    op.drop_index('ix_production_logs_shift_id_created_at', table_name='production_logs')
+    op.drop_index('ix_production_logs_created_at_id', table_name='production_logs')
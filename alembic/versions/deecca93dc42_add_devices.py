@@ -0,0 +1,82 @@
+"""Add devices registry
+
+Revision ID: deecca93dc42
+Revises: 28b7ebf7be93
+Create Date: 2026-10-18 07:29:13.950750
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'deecca93dc42'
+down_revision: Union[str, None] = '28b7ebf7be93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Registry previously hard-coded in app/routers/device_monitor.py
+INITIAL_DEVICES = [
+    # Fingerprints
+    {"name": "FP OFFICE (Local)", "host": "172.16.0.18", "port": 4370, "group": "Fingerprint"},
+    {"name": "FP OFFICE (Public)", "host": "103.164.99.2", "port": 4, "group": "Fingerprint"},
+
+    {"name": "FP KAWAT (Local)", "host": "172.16.0.17", "port": 4370, "group": "Fingerprint"},
+    {"name": "FP KAWAT (Public)", "host": "103.164.99.2", "port": 3, "group": "Fingerprint"},
+
+    {"name": "FP ACS/QCR (Local)", "host": "172.16.0.16", "port": 4370, "group": "Fingerprint"},
+    {"name": "FP ACS/QCR (Public)", "host": "103.164.99.2", "port": 2, "group": "Fingerprint"},
+
+    {"name": "FP PRINTSEWING/QC (Local)", "host": "172.16.0.15", "port": 4370, "group": "Fingerprint"},
+    {"name": "FP PRINTSEWING/QC (Public)", "host": "103.164.99.2", "port": 1, "group": "Fingerprint"},
+
+    {"name": "FP PEKANBARU", "host": "103.183.14.82", "port": 11043, "group": "Fingerprint"},
+
+    # DVRs
+    {"name": "DVR HRD BEKASI", "host": "103.164.99.2", "port": 11011, "group": "DVR"},
+    {"name": "DVR PPIC BEKASI", "host": "103.164.99.2", "port": 11012, "group": "DVR"},
+    {"name": "DVR SECURITY BEKASI", "host": "103.164.99.2", "port": 11013, "group": "DVR"},
+    {"name": "DVR PRODUKSI 1 BEKASI", "host": "103.164.99.2", "port": 11014, "group": "DVR"},
+    {"name": "DVR GUDANG JADI BEKASI", "host": "103.164.99.2", "port": 11015, "group": "DVR"},
+    {"name": "DVR PRODUKSI 2 BEKASI", "host": "103.164.99.2", "port": 11016, "group": "DVR"}, # Asumsi baris 35 adalah unit ke-2
+    {"name": "DVR KAWAT BEKASI", "host": "103.164.99.2", "port": 11017, "group": "DVR"},
+    {"name": "DVR ICU + BANTAL BEKASI", "host": "103.164.99.2", "port": 11018, "group": "DVR"},
+
+    {"name": "DVR PRODUKSI BANDUNG", "host": "36.93.215.10", "port": 11021, "group": "DVR"},
+    {"name": "DVR OFFICE BANDUNG", "host": "36.93.215.10", "port": 11022, "group": "DVR"},
+
+    {"name": "DVR OFFICE PEKANBARU", "host": "103.183.14.82", "port": 11042, "group": "DVR"},
+    {"name": "DVR PRODUKSI PEKANBARU", "host": "103.183.14.82", "port": 11041, "group": "DVR"},
+]
+
+
+def upgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    devices = op.create_table('devices',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('host', sa.String(length=255), nullable=False),
+    sa.Column('port', sa.Integer(), nullable=False),
+    sa.Column('group', sa.String(length=50), nullable=False),
+    sa.Column('probe_interval_seconds', sa.Integer(), nullable=True),
+    sa.Column('probe_timeout_seconds', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), server_default=sa.text('true'), nullable=False),
+    sa.CheckConstraint('port BETWEEN 1 AND 65535', name='devices_port_check'),
+    sa.CheckConstraint('probe_interval_seconds > 0', name='devices_probe_interval_seconds_check'),
+    sa.CheckConstraint('probe_timeout_seconds > 0', name='devices_probe_timeout_seconds_check'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_devices_group'), 'devices', ['group'], unique=False)
+    # ### end Alembic commands ###
+    op.bulk_insert(devices, INITIAL_DEVICES)
+
+
+def downgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f('ix_devices_group'), table_name='devices')
+    op.drop_table('devices')
+    # ### end Alembic commands ###
+
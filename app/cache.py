@@ -0,0 +1,113 @@
+"""
+Versioned in-process cache for reference data
+
+Every cached entity type has a generation counter. Entries are stored with the
+generation they were loaded under and are ignored once it moves on, so
+invalidating is a counter bump. Write handlers call invalidate() before commit:
+it sends a NOTIFY on CACHE_CHANNEL inside the transaction, so every API
+process invalidates once the transaction commits. This process also bumps
+its own counters right after the commit.
+"""
+import threading
+from typing import Any, Callable
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app import models, pg_listener
+
+CACHE_CHANNEL = "reference_cache"
+
+ENTITIES = {
+    "divisions": models.Division,
+    "departments": models.Department,
+    "positions": models.Position,
+    "sub_positions": models.SubPosition,
+    "shifts": models.Shift,
+    "suppliers": models.Supplier,
+    "items": models.Item,
+    "problem_comments": models.ProblemComment,
+}
+ENTITY_BY_MODEL = {model: entity for entity, model in ENTITIES.items()}
+
+# Cached responses embed the related entity (department.division, sub_position.position)
+DEPENDENTS = {
+    "divisions": ("departments",),
+    "positions": ("sub_positions",),
+}
+
+_lock = threading.Lock()
+_generations = dict.fromkeys(ENTITIES, 0)
+_entries: dict[tuple[str, str], tuple[int, Any]] = {}
+
+
+def get(entity: str, key: str, loader: Callable[[], Any]) -> Any:
+    """
+    Return the cached value for (entity, key), loading it on a miss
+
+    Args:
+        entity: Cached entity type, one of ENTITIES
+        key: Which view of the entity (e.g. "list", "ids")
+        loader: Builds the value; must not return ORM instances bound to a session
+    """
+    with _lock:
+        generation = _generations[entity]
+        entry = _entries.get((entity, key))
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+
+    value = loader()
+    with _lock:
+        # Skip storing if a write landed while loading; the next read reloads
+        if _generations[entity] == generation:
+            _entries[(entity, key)] = (generation, value)
+    return value
+
+
+def get_ids(db: Session, model) -> frozenset:
+    """All primary keys of a cached model, for foreign key checks"""
+    return get(ENTITY_BY_MODEL[model], "ids", lambda: frozenset(db.scalars(select(model.id)).all()))
+
+
+def bump(*entities: str):
+    """Invalidate the given entity types (and the ones embedding them) in this process"""
+    with _lock:
+        for entity in entities:
+            for affected in (entity, *DEPENDENTS.get(entity, ())):
+                _generations[affected] += 1
+                for key in [key for key in _entries if key[0] == affected]:
+                    del _entries[key]
+
+
+def bump_all():
+    bump(*ENTITIES)
+
+
+def invalidate(db: Session, entity: str):
+    """
+    Invalidate an entity type everywhere once the current transaction commits
+
+    Call it from write handlers before db.commit().
+    """
+    db.info.setdefault("cache_invalidations", set()).add(entity)
+    db.execute(select(func.pg_notify(CACHE_CHANNEL, entity)))
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session: Session):
+    entities = session.info.pop("cache_invalidations", None)
+    if entities:
+        bump(*entities)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session):
+    session.info.pop("cache_invalidations", None)
+
+
+def _on_notify(payload: str):
+    if payload in ENTITIES:
+        bump(payload)
+
+
+pg_listener.register(CACHE_CHANNEL, _on_notify)
+# Invalidations sent while the listener was disconnected are lost
+pg_listener.on_connect(bump_all)
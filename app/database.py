@@ -1,7 +1,11 @@
 import os
+import time
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.requests import Request
+from app import db_metrics, query_stats
 
 load_dotenv()
 
@@ -10,19 +14,63 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
+# Optional streaming replica for GET handlers (get_read_db)
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
+
 # Ensure postgresql:// format (not postgres://) for SQLAlchemy 2.0+
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith("postgres://"):
+    DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace("postgres://", "postgresql://", 1)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes"}
+
+
+# Pool sizing; GET /system/db-pool shows how close the pool runs to these limits.
+# Without pre-ping a checkout skips the extra round trip; a connection that turns
+# out to be dead then fails its first query and the pool is invalidated instead.
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "300")),
+    "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", "true"),
+}
 
-# Add connection pool settings for better reliability
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=300,    # Recycle connections after 5 minutes
-    echo=False
+    poolclass=db_metrics.InstrumentedQueuePool,
+    echo=False,
+    **POOL_OPTIONS
 )
+db_metrics.instrument(engine)
+query_stats.instrument(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# After a successful write the middleware in app.main sets this cookie, and reads
+# go to the primary until it expires so clients see their own changes. Browsers
+# may drop the cookie on cross-site calls, so the response also carries the
+# deadline in a header that clients can send back.
+READ_PRIMARY_COOKIE = "db_read_primary"
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+READ_YOUR_WRITES_SECONDS = int(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+replica_engine = None
+ReadSessionLocal = None
+if DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        DATABASE_REPLICA_URL,
+        poolclass=db_metrics.InstrumentedQueuePool,
+        execution_options={"postgresql_readonly": True},
+        echo=False,
+        **POOL_OPTIONS
+    )
+    db_metrics.instrument(replica_engine)
+    query_stats.instrument(replica_engine)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -31,3 +79,84 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether the client wrote recently, going by the cookie or the echoed header"""
+    if request.cookies.get(READ_PRIMARY_COOKIE):
+        return True
+    try:
+        return float(request.headers.get(READ_PRIMARY_HEADER, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def read_sessionmaker(request: Request) -> sessionmaker:
+    """Session factory for read-only handlers: the replica unless the client just wrote"""
+    if ReadSessionLocal is None or reads_from_primary(request):
+        return SessionLocal
+    return ReadSessionLocal
+
+
+def get_read_db(request: Request):
+    """Read-only session for GET handlers, see read_sessionmaker()"""
+    db = read_sessionmaker(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _async_url(url: str):
+    """Same database through asyncpg, which spells libpq's sslmode as ssl"""
+    url = make_url(url).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    query.pop("channel_binding", None)
+    return url.set(query=query)
+
+
+# Optional asyncio stack: with DB_ASYNC enabled the routers in app/routers/*_async.py
+# serve their endpoints on the event loop instead of the threadpool
+ASYNC_DB_ENABLED = _env_flag("DB_ASYNC", "false")
+
+async_engine = None
+async_replica_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+if ASYNC_DB_ENABLED:
+    async_engine = create_async_engine(
+        _async_url(DATABASE_URL),
+        poolclass=db_metrics.InstrumentedAsyncQueuePool,
+        echo=False,
+        **POOL_OPTIONS
+    )
+    db_metrics.instrument(async_engine.sync_engine)
+    query_stats.instrument(async_engine.sync_engine)
+    # Handlers serialize after commit, and lazy loads are not possible on the event loop
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = AsyncSessionLocal
+    if DATABASE_REPLICA_URL:
+        async_replica_engine = create_async_engine(
+            _async_url(DATABASE_REPLICA_URL),
+            poolclass=db_metrics.InstrumentedAsyncQueuePool,
+            execution_options={"postgresql_readonly": True},
+            echo=False,
+            **POOL_OPTIONS
+        )
+        db_metrics.instrument(async_replica_engine.sync_engine)
+        query_stats.instrument(async_replica_engine.sync_engine)
+        AsyncReadSessionLocal = async_sessionmaker(async_replica_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """get_read_db() for the async handlers"""
+    factory = AsyncSessionLocal if reads_from_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
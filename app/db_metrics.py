@@ -0,0 +1,149 @@
+"""
+Connection pool counters for sizing the pool from data
+
+instrument() hooks an engine's pool events (checkout, checkin, connect,
+invalidate). Acquire time, meaning the wait for a free connection plus opening
+a new one, cannot be seen through events. The pool classes below time their
+_do_get() instead, and that also catches "QueuePool limit reached" timeouts.
+"""
+import time
+import bisect
+import threading
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds of the acquire time histogram, in milliseconds
+ACQUIRE_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+
+
+class PoolMetrics:
+    """Cumulative counters of one engine's pool since startup"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.overflow_checkouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.acquire_seconds_total = 0.0
+        self.acquire_seconds_max = 0.0
+        self.acquire_buckets = [0] * (len(ACQUIRE_BUCKETS_MS) + 1)
+
+    def record_acquire(self, seconds: float, timed_out: bool):
+        bucket = bisect.bisect_left(ACQUIRE_BUCKETS_MS, seconds * 1000)
+        with self._lock:
+            self.acquire_seconds_total += seconds
+            self.acquire_seconds_max = max(self.acquire_seconds_max, seconds)
+            self.acquire_buckets[bucket] += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def record_checkout(self, checked_out: int, overflow: int):
+        with self._lock:
+            self.checkouts += 1
+            if overflow > 0:
+                self.overflow_checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            acquired = sum(self.acquire_buckets)
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "timeouts": self.timeouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+                "acquire_ms_avg": round(self.acquire_seconds_total * 1000 / acquired, 3) if acquired else None,
+                "acquire_ms_max": round(self.acquire_seconds_max * 1000, 3),
+                "acquire_ms_histogram": {
+                    **{f"le_{bound}": count for bound, count in zip(ACQUIRE_BUCKETS_MS, self.acquire_buckets)},
+                    "inf": self.acquire_buckets[-1],
+                },
+            }
+
+
+class _TimedAcquire:
+    """Times every connection acquisition of a QueuePool"""
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.metrics.record_acquire(time.perf_counter() - started, timed_out)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedAcquire, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedAcquire, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine: Engine) -> PoolMetrics:
+    """Attach counters to an engine built with one of the instrumented pool classes"""
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool = engine.pool
+        metrics.record_checkout(pool.checkedout(), max(pool.overflow(), 0))
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.count("checkins")
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.count("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("soft_invalidations")
+
+    return metrics
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Current pool occupancy plus the cumulative counters"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        **pool.metrics.snapshot(),
+    }
@@ -0,0 +1,215 @@
+"""
+Background device poller with cached status and state-change history
+
+Each active device in the devices table is probed by its own task on its own
+interval, so dashboards read the cached state instead of triggering probes.
+Online/offline transitions are kept in a bounded in-memory log per device for
+uptime and outage reporting. The registry is reloaded every
+DEVICE_REGISTRY_REFRESH seconds, and immediately after a write through the
+device CRUD endpoints of this process.
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Optional
+from app.database import SessionLocal
+from app.device_probe import PROBE_TIMEOUT, probe
+from app.events import monitor_events
+from app import models
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = float(os.getenv("DEVICE_POLL_INTERVAL", "30"))
+REGISTRY_REFRESH = float(os.getenv("DEVICE_REGISTRY_REFRESH", "60"))
+
+# Transitions kept per device; older ones are dropped first
+MAX_TRANSITIONS = 1000
+
+
+class DeviceState:
+    """Latest probe result and transition log of one device"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status: Optional[str] = None
+        self.latency_ms: Optional[float] = None
+        self.last_checked: Optional[float] = None
+        self.last_seen: Optional[float] = None
+        self.status_since: Optional[float] = None
+        # (timestamp, status) pairs, starting with the first observation
+        self.transitions: deque = deque(maxlen=MAX_TRANSITIONS)
+
+    def update(self, latency_ms: Optional[float], checked_at: float):
+        status = "online" if latency_ms is not None else "offline"
+        if status != self.status:
+            self.transitions.append((checked_at, status))
+            self.status_since = checked_at
+            if self.status is not None:
+                logger.info("Device %s went %s", self.name, status)
+        self.status = status
+        self.latency_ms = latency_ms
+        self.last_checked = checked_at
+        if latency_ms is not None:
+            self.last_seen = checked_at
+
+    def history(self, start: float, end: float) -> dict:
+        """
+        Uptime and outages between start and end
+
+        Only time covered by observations counts toward the uptime percentage, so a
+        freshly started poller does not report the unobserved window as downtime.
+        """
+        if not self.transitions:
+            return {"observed_seconds": 0, "uptime_percent": None, "outages": []}
+
+        # Each transition opens an interval that lasts until the next one (or end)
+        boundaries = list(self.transitions) + [(end, None)]
+        observed = online = 0.0
+        outages = []
+        for (since, status), (until, _) in zip(boundaries, boundaries[1:]):
+            since, until = max(since, start), min(until, end)
+            if until <= since:
+                continue
+            observed += until - since
+            if status == "online":
+                online += until - since
+            else:
+                outages.append({
+                    "start": since,
+                    "end": None if until == end and status == self.status else until,
+                    "duration_seconds": round(until - since, 1),
+                })
+
+        return {
+            "observed_seconds": round(observed, 1),
+            "uptime_percent": round(online * 100 / observed, 2) if observed else None,
+            "outages": outages,
+        }
+
+
+# Active devices by id, as last loaded from the database
+_registry: dict[int, dict] = {}
+_states: dict[int, DeviceState] = {}
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_reload: Optional[asyncio.Event] = None
+
+
+def registry(group: Optional[str] = None) -> list[dict]:
+    """Active devices in id order, optionally limited to one group"""
+    return [
+        device for _, device in sorted(_registry.items())
+        if group is None or device["group"] == group
+    ]
+
+
+def get_state(device_id: int) -> Optional[DeviceState]:
+    return _states.get(device_id)
+
+
+def describe(device: dict) -> dict:
+    """Public status entry of a registry device, as served by /devices/status"""
+    state = _states.get(device["id"])
+    return {
+        "id": device["id"],
+        "name": device["name"],
+        "host": device["host"],
+        "port": device["port"],
+        "group": device["group"],
+        "status": state.status if state and state.status else "unknown",
+        "latency_ms": round(state.latency_ms, 1) if state and state.latency_ms is not None else None,
+        "last_checked": state.last_checked if state else None,
+        "last_seen": state.last_seen if state else None,
+        "status_since": state.status_since if state else None
+    }
+
+
+def request_reload():
+    """Ask the poller to reload the registry now; safe to call from request threads"""
+    if _loop is not None and _reload is not None:
+        _loop.call_soon_threadsafe(_reload.set)
+
+
+def load_registry() -> dict[int, dict]:
+    """Read the active devices from the database (blocking)"""
+    db = SessionLocal()
+    try:
+        devices = db.query(models.Device).filter(models.Device.is_active.is_(True)).all()
+        return {
+            device.id: {
+                "id": device.id,
+                "name": device.name,
+                "host": device.host,
+                "port": device.port,
+                "group": device.group,
+                "interval": device.probe_interval_seconds,
+                "timeout": float(device.probe_timeout_seconds) if device.probe_timeout_seconds else None,
+            }
+            for device in devices
+        }
+    finally:
+        db.close()
+
+
+async def _poll_device(device: dict):
+    interval = device["interval"] or POLL_INTERVAL
+    timeout = device["timeout"] or PROBE_TIMEOUT
+    state = _states.setdefault(device["id"], DeviceState(device["name"]))
+    # Spread the first round of probes instead of firing every device at once
+    await asyncio.sleep(random.uniform(0, min(interval, 5)))
+    while True:
+        try:
+            latency_ms = await probe(device["host"], device["port"], timeout)
+            previous = state.status
+            state.update(latency_ms, time.time())
+            if state.status != previous:
+                monitor_events.publish("device", describe(device))
+        except Exception:
+            logger.exception("Probe of %s failed", device["name"])
+        await asyncio.sleep(interval)
+
+
+def _sync_tasks(tasks: dict[int, tuple[dict, asyncio.Task]], devices: dict[int, dict]):
+    """Restart tasks whose device changed, stop removed ones and start new ones"""
+    for device_id, (device, task) in list(tasks.items()):
+        if devices.get(device_id) != device:
+            task.cancel()
+            del tasks[device_id]
+            new = devices.get(device_id)
+            # A different endpoint starts a fresh history; other edits keep it
+            if new is None or (new["host"], new["port"]) != (device["host"], device["port"]):
+                _states.pop(device_id, None)
+            if new is None:
+                monitor_events.publish("device_removed", {"id": device_id, "name": device["name"], "group": device["group"]})
+            elif new["name"] != device["name"] and device_id in _states:
+                _states[device_id].name = new["name"]
+    for device_id, device in devices.items():
+        if device_id not in tasks:
+            tasks[device_id] = (device, asyncio.create_task(_poll_device(device)))
+
+
+async def run_poller():
+    """Poll every active device until cancelled, following registry changes"""
+    global _loop, _reload, _registry
+    _loop = asyncio.get_running_loop()
+    _reload = asyncio.Event()
+    tasks: dict[int, tuple[dict, asyncio.Task]] = {}
+    try:
+        while True:
+            try:
+                devices = await asyncio.to_thread(load_registry)
+                _sync_tasks(tasks, devices)
+                _registry = devices
+            except Exception:
+                logger.exception("Could not refresh device registry")
+            try:
+                await asyncio.wait_for(_reload.wait(), REGISTRY_REFRESH)
+            except asyncio.TimeoutError:
+                pass
+            _reload.clear()
+    finally:
+        for _, task in tasks.values():
+            task.cancel()
@@ -0,0 +1,57 @@
+"""
+Asynchronous TCP reachability probes for fingerprint readers and DVRs
+
+Probes run as coroutines on the event loop with asyncio.open_connection, so a
+few hundred devices cost no threads. A process-wide semaphore caps how many
+connection attempts are in flight at once, and every probe has its own timeout.
+"""
+import os
+import time
+import asyncio
+from typing import Optional
+
+PROBE_TIMEOUT = float(os.getenv("DEVICE_PROBE_TIMEOUT", "2"))
+PROBE_CONCURRENCY = int(os.getenv("DEVICE_PROBE_CONCURRENCY", "100"))
+
+_semaphore = asyncio.Semaphore(PROBE_CONCURRENCY)
+
+
+async def probe(host: str, port: int, timeout: float = PROBE_TIMEOUT) -> Optional[float]:
+    """
+    Open and close a TCP connection to host:port
+
+    Args:
+        host: Device host name or IP
+        port: TCP port
+        timeout: Seconds allowed for the connection attempt
+
+    Returns:
+        Connect round-trip time in milliseconds, or None if the port is unreachable
+    """
+    async with _semaphore:
+        start = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        latency_ms = (time.perf_counter() - start) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return latency_ms
+
+
+async def probe_devices(devices: list[dict], timeout: float = PROBE_TIMEOUT) -> list[Optional[float]]:
+    """
+    Probe every device concurrently
+
+    Args:
+        devices: Dicts with "host" and "port"
+        timeout: Per-probe timeout in seconds
+
+    Returns:
+        Latency in milliseconds (None when offline) for each device, in input order
+    """
+    return await asyncio.gather(*(probe(device["host"], device["port"], timeout) for device in devices))
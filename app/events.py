@@ -0,0 +1,135 @@
+"""
+In-process broadcast fan-out for Server-Sent Events and WebSockets
+
+Producers call publish() on the event loop; every connected client owns a bounded
+queue, so one slow client never holds up the others. A client whose queue fills
+up is dropped and has to reconnect, which also resends the initial snapshot.
+"""
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Callable, Optional
+from starlette.websockets import WebSocket
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 1000
+KEEPALIVE_SECONDS = 15
+
+# Marks a subscriber that fell too far behind
+_OVERFLOW = object()
+
+
+class Broadcaster:
+    """Fan events out to every subscriber queue"""
+
+    def __init__(self):
+        self._subscribers: set[asyncio.Queue] = set()
+        self._sequence = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: dict):
+        """Queue an event for every subscriber; must be called on the event loop"""
+        if not self._subscribers:
+            return
+        self._sequence += 1
+        message = (self._sequence, event_type, data)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(_OVERFLOW)
+                logger.warning("Dropped slow event subscriber")
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a new subscriber queue of (sequence, event_type, data) messages"""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+
+def format_sse(event_type: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Serialize one event in text/event-stream format"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def sse_stream(broadcaster: Broadcaster,
+                     initial: Optional[Callable[[], list[tuple[str, dict]]]] = None,
+                     accept: Optional[Callable[[str, dict], bool]] = None) -> AsyncIterator[str]:
+    """
+    SSE body: the initial events, then live events, with keepalive comments while idle
+
+    Args:
+        broadcaster: Source of live events
+        initial: Builds the events sent first; called after subscribing so nothing
+            published in between is lost
+        accept: Optional filter; events it rejects are skipped for this client
+    """
+    queue = broadcaster.subscribe()
+    try:
+        for event_type, data in (initial() if initial else []):
+            yield format_sse(event_type, data)
+
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is _OVERFLOW:
+                return
+            sequence, event_type, data = message
+            if accept is None or accept(event_type, data):
+                yield format_sse(event_type, data, sequence)
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+async def websocket_stream(websocket: WebSocket, broadcaster: Broadcaster,
+                           accept: Optional[Callable[[str, dict], bool]] = None):
+    """
+    Send live events to an accepted WebSocket as JSON until either side goes away
+
+    Each message is {"id", "event", "data"}. Messages from the client are ignored;
+    a client that falls too far behind is closed with 1013 (try again later).
+    """
+    queue = broadcaster.subscribe()
+    receiver = asyncio.ensure_future(websocket.receive())
+    getter = asyncio.ensure_future(queue.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({receiver, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    return
+                receiver = asyncio.ensure_future(websocket.receive())
+            if getter in done:
+                message = getter.result()
+                if message is _OVERFLOW:
+                    await websocket.close(code=1013)
+                    return
+                sequence, event_type, data = message
+                if accept is None or accept(event_type, data):
+                    await websocket.send_json({"id": sequence, "event": event_type, "data": data})
+                getter = asyncio.ensure_future(queue.get())
+    finally:
+        receiver.cancel()
+        getter.cancel()
+        broadcaster.unsubscribe(queue)
+
+
+# Device and system status changes
+monitor_events = Broadcaster()
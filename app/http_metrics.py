@@ -0,0 +1,103 @@
+"""
+Prometheus request metrics, labelled by route template
+
+PrometheusMiddleware counts requests by method, route and status. It also
+records their latency, including the time spent streaming the body, and tracks
+how many are in flight per method. Routes are labelled by their path template
+(/workers/{worker_id}), and unmatched paths share one label, so the series
+count stays bounded.
+
+With several workers (uvicorn --workers, gunicorn), set PROMETHEUS_MULTIPROC_DIR
+to an empty directory that every worker shares and wipe it before each start.
+Workers then write their samples there and /metrics aggregates all of them.
+"""
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+UNMATCHED_ROUTE = "unmatched"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status",
+    ["method", "route", "status"]
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, until the body is sent",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+# By method only: the route is not known until the request has been dispatched
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled",
+    ["method"], multiprocess_mode="livesum"
+)
+UNHANDLED_EXCEPTIONS = Counter(
+    "http_unhandled_exceptions_total", "Exceptions that reached the global exception handler",
+    ["method", "route", "exception"]
+)
+
+
+def _route_template(scope: Scope) -> str:
+    """Path template of the route that handled this request
+
+    The router records the matched route in the scope while dispatching, so this
+    is read once the request is done. 404s have no route.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class PrometheusMiddleware:
+    """Pure ASGI middleware, so streamed responses are timed to their last chunk"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as exc:
+            UNHANDLED_EXCEPTIONS.labels(method, _route_template(scope), type(exc).__name__).inc()
+            raise
+        finally:
+            route = _route_template(scope)
+            REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status)).inc()
+            in_progress.dec()
+
+
+def render() -> tuple[bytes, str]:
+    """Exposition body and content type; aggregates every worker in multiprocess mode"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_exit():
+    """Drop this worker's live gauges from the aggregate; call on shutdown"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,84 @@
+"""
+Live production log feed over Postgres LISTEN/NOTIFY
+
+Write endpoints call notify_log_changes() inside their transaction, so Postgres
+delivers the events only if the transaction commits, and to every API process.
+The process-wide listener (app.pg_listener) hands them to log_events, which fans
+them out to this process's SSE/WebSocket clients.
+"""
+import json
+import logging
+from typing import Iterable
+from sqlalchemy import ARRAY, BigInteger, Text, any_, cast, func, literal, select
+from sqlalchemy.orm import Session
+from app.events import Broadcaster
+from app import models, pg_listener
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "production_log_changes"
+
+# Production log create/update/approve/delete events
+log_events = Broadcaster()
+
+
+def notify_log_changes(db: Session, action: str, log_ids: Iterable[int], **extra):
+    """
+    Queue one NOTIFY per log with a compact change event, in a single statement
+
+    Run it before commit, and before the rows are deleted for action="delete".
+
+    Args:
+        db: Session of the write transaction
+        action: create, update, approve or delete
+        log_ids: Changed production log IDs
+        extra: Constant fields added to every event (e.g. role for approvals)
+    """
+    ids = list(set(log_ids))
+    if not ids:
+        return
+    log = models.ProductionLog
+    fields = ["action", literal(action)]
+    for name, value in extra.items():
+        fields += [name, literal(value)]
+    fields += [
+        "id", log.id,
+        "shift_id", log.shift_id,
+        "position_id", log.position_id,
+        "sub_position_id", log.sub_position_id,
+        "worker_id", log.worker_id,
+        "department_id", models.Worker.department_id,
+        "approved_coordinator", log.approved_coordinator,
+        "approved_spv", log.approved_spv,
+    ]
+    db.execute(
+        select(func.pg_notify(CHANNEL, cast(func.json_build_object(*fields), Text)))
+        .select_from(log)
+        .outerjoin(models.Worker, models.Worker.id == log.worker_id)
+        .where(log.id == any_(literal(ids, ARRAY(BigInteger))))
+    )
+
+
+def notify_cascaded_deletes(db: Session, *conditions):
+    """
+    Queue delete events for the logs an ORM cascade removes along with their parent
+
+    Run it before the parent (worker, shift, item, ...) is deleted.
+
+    Args:
+        db: Session of the write transaction
+        conditions: WHERE clauses on ProductionLog selecting the parent's logs
+    """
+    notify_log_changes(db, "delete", db.scalars(select(models.ProductionLog.id).where(*conditions)))
+
+
+def _on_notify(payload: str):
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed %s payload", CHANNEL)
+        return
+    log_events.publish(event["action"], event)
+
+
+pg_listener.register(CHANNEL, _on_notify)
@@ -1,10 +1,17 @@
 import os
+import time
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError
-from app.database import Base, engine
+from app.database import (
+    ASYNC_DB_ENABLED, DATABASE_REPLICA_URL, READ_PRIMARY_COOKIE, READ_PRIMARY_HEADER, READ_YOUR_WRITES_SECONDS,
+    Base, async_engine, engine
+)
+from app import cache, device_poller, http_metrics, log_feed, pg_listener, query_stats, system_sampler
 from app.routers import (
     worker, position, sub_position,
     shift, supplier, item,
@@ -12,11 +19,30 @@ from app.routers import (
     division, department,
     production_target, attendance,
     production_plan, system_monitor,
-    device_monitor
+    device_monitor, production_rollup,
+    monitor, sync, metrics,
+    attendance_async, production_log_async,
+    production_plan_async, worker_async
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background samplers live for the lifetime of the process
+    tasks = [
+        asyncio.create_task(system_sampler.run_sampler()),
+        asyncio.create_task(device_poller.run_poller()),
+        asyncio.create_task(pg_listener.run_listener()),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    if async_engine is not None:
+        await async_engine.dispose()
+    http_metrics.mark_worker_exit()
+
 app = FastAPI(
     title="Matrix API",
+    lifespan=lifespan,
     redirect_slashes=False  # Disable automatic redirect from /positions to /positions/
 )
 
@@ -79,9 +105,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # With credentials browsers take "*" literally, so headers clients read are listed
+    expose_headers=["*", READ_PRIMARY_HEADER],
 )
 
+if DATABASE_REPLICA_URL:
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        """Pin the client's reads to the primary for a while after it changed something"""
+        response = await call_next(request)
+        if request.method not in {"GET", "HEAD", "OPTIONS"} and response.status_code < 400:
+            # The frontends call cross-site, where only SameSite=None cookies are sent
+            secure = request.url.scheme == "https"
+            response.set_cookie(
+                READ_PRIMARY_COOKIE, "1",
+                max_age=READ_YOUR_WRITES_SECONDS, httponly=True,
+                secure=secure, samesite="none" if secure else "lax"
+            )
+            response.headers[READ_PRIMARY_HEADER] = str(int(time.time()) + READ_YOUR_WRITES_SECONDS)
+        return response
+
+# SQL statement counts per request, X-DB-Queries / X-DB-Time headers with DEBUG
+app.add_middleware(query_stats.QueryStatsMiddleware)
+
+# Added last so it wraps everything else and times the whole request
+app.add_middleware(http_metrics.PrometheusMiddleware)
+
 auto_create_tables = os.getenv("AUTO_CREATE_TABLES", "").strip().lower() in {"1", "true", "yes"}
 if auto_create_tables:
     try:
@@ -89,6 +138,15 @@ if auto_create_tables:
     except Exception:
         logger.exception("Could not auto-create tables")
 
+# With DB_ASYNC the async handlers are matched first; endpoints they do not
+# implement (mostly writes) fall through to the sync routers below. They share
+# the sync routes' contract, so only those are documented.
+if ASYNC_DB_ENABLED:
+    app.include_router(production_log_async.router, include_in_schema=False)
+    app.include_router(production_plan_async.router, include_in_schema=False)
+    app.include_router(attendance_async.router, include_in_schema=False)
+    app.include_router(worker_async.router, include_in_schema=False)
+
 # Include all routers
 app.include_router(division.router)
 app.include_router(department.router)
@@ -100,8 +158,12 @@ app.include_router(supplier.router)
 app.include_router(item.router)
 app.include_router(problem_comment.router)
 app.include_router(production_log.router)
+app.include_router(production_rollup.router)
 app.include_router(production_target.router)
 app.include_router(attendance.router)
 app.include_router(production_plan.router)
 app.include_router(system_monitor.router)
 app.include_router(device_monitor.router)
+app.include_router(monitor.router)
+app.include_router(sync.router)
+app.include_router(metrics.router)
@@ -1,9 +1,9 @@
 from sqlalchemy import (
     Column, Integer, String, ForeignKey, BigInteger,
-    Numeric, CheckConstraint, TIMESTAMP, Boolean, Text, Enum, Date, Time
+    Numeric, CheckConstraint, TIMESTAMP, Boolean, Text, Enum, Date, Time, Index
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.database import Base
 import enum
 
@@ -30,6 +30,11 @@ class Attendance(Base):
     # Relationships
     worker = relationship("Worker", back_populates="attendances")
 
+    __table_args__ = (
+        Index("ix_attendances_worker_id_date", "worker_id", "date"),
+        Index("ix_attendances_date", "date"),
+    )
+
 class Division(Base):
     __tablename__ = "divisions"
 
@@ -54,6 +59,7 @@ class Department(Base):
     workers = relationship("Worker", back_populates="department")
 
     __table_args__ = (
+        Index("ix_departments_division_id", "division_id"),
         {"extend_existing": True}
     )
 
@@ -72,6 +78,11 @@ class ProductionTarget(Base):
     position = relationship("Position", back_populates="production_targets", foreign_keys=[position_id])
     sub_position = relationship("SubPosition", back_populates="production_targets", foreign_keys=[sub_position_id])
 
+    __table_args__ = (
+        Index("ix_production_targets_position_id_sub_position_id", "position_id", "sub_position_id"),
+        Index("ix_production_targets_sub_position_id", "sub_position_id"),
+    )
+
 
 class ProductionPlan(Base):
     __tablename__ = "production_plan"
@@ -95,6 +106,17 @@ class ProductionPlan(Base):
     sub_position = relationship("SubPosition", back_populates="production_plans")
     created_by_worker = relationship("Worker", back_populates="production_plans_created", foreign_keys=[created_by])
 
+    # get_production_plans always sorts by created_at DESC, so each filter column is paired with it
+    __table_args__ = (
+        Index("ix_production_plan_created_at", "created_at"),
+        Index("ix_production_plan_worker_id_created_at", "worker_id", "created_at"),
+        Index("ix_production_plan_created_by_created_at", "created_by", "created_at"),
+        Index("ix_production_plan_shift_id_created_at", "shift_id", "created_at"),
+        Index("ix_production_plan_item_id_created_at", "item_id", "created_at"),
+        Index("ix_production_plan_position_id_sub_position_id", "position_id", "sub_position_id"),
+        Index("ix_production_plan_sub_position_id", "sub_position_id"),
+    )
+
 
 class Position(Base):
     __tablename__ = "positions"
@@ -103,6 +125,7 @@ class Position(Base):
     code = Column(String(20), unique=True, nullable=False)
     name = Column(String(50), nullable=True)
     unit = Column(String(10), nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
     production_targets = relationship("ProductionTarget", back_populates="position")
@@ -123,6 +146,7 @@ class SubPosition(Base):
     id = Column(Integer, primary_key=True)
     position_id = Column(Integer, ForeignKey("positions.id", ondelete="RESTRICT"), nullable=False)
     code = Column(String(30), nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
     production_targets = relationship("ProductionTarget", back_populates="sub_position")
@@ -131,6 +155,7 @@ class SubPosition(Base):
     production_plans = relationship("ProductionPlan", back_populates="sub_position")
 
     __table_args__ = (
+        Index("ix_sub_positions_position_id", "position_id"),
         {"extend_existing": True}
     )
 
@@ -143,6 +168,7 @@ class Worker(Base):
     password = Column(String(255), nullable=True)
     position_id = Column(Integer, ForeignKey("positions.id", ondelete="RESTRICT"), nullable=True)
     department_id = Column(Integer, ForeignKey("departments.id", ondelete="RESTRICT"), nullable=True)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
     position = relationship("Position", back_populates="workers")
@@ -155,6 +181,8 @@ class Worker(Base):
     attendances = relationship("Attendance", back_populates="worker", cascade="all, delete-orphan")
 
     __table_args__ = (
+        Index("ix_workers_position_id", "position_id"),
+        Index("ix_workers_department_id", "department_id"),
         {"extend_existing": True}
     )
 
@@ -164,6 +192,7 @@ class Shift(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String(20), unique=True, nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
     production_logs = relationship("ProductionLog", back_populates="shift", cascade="all, delete-orphan")
@@ -175,6 +204,7 @@ class Supplier(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String(100), unique=True, nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
     production_logs = relationship("ProductionLog", back_populates="supplier", cascade="all, delete-orphan")
@@ -187,6 +217,7 @@ class Item(Base):
     item_number = Column(String(50), unique=True, nullable=False)
     item_name = Column(String(100), nullable=True)
     spec = Column(Text, nullable=True)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
     production_logs = relationship("ProductionLog", back_populates="item", cascade="all, delete-orphan")
@@ -198,6 +229,7 @@ class ProblemComment(Base):
 
     id = Column(Integer, primary_key=True)
     description = Column(String(255), unique=True, nullable=False)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
     production_log_problem_comments = relationship("ProductionLogProblemComment", back_populates="problem_comment", cascade="all, delete-orphan")
@@ -241,10 +273,55 @@ class ProductionLog(Base):
         CheckConstraint("qty_output >= 0", name="production_logs_qty_output_check"),
         CheckConstraint("qty_reject >= 0", name="production_logs_qty_reject_check"),
         CheckConstraint("(approved_spv IS NULL) OR (approved_coordinator = true)", name="spv_after_coordinator_check"),
+        # Composite indexes backing the GET /production-logs filters and (created_at, id) keyset paging
+        Index("ix_production_logs_created_at_id", "created_at", "id"),
+        Index("ix_production_logs_shift_id_created_at", "shift_id", "created_at", "id"),
+        Index("ix_production_logs_worker_id_created_at", "worker_id", "created_at", "id"),
+        Index("ix_production_logs_position_id_sub_position_id_created_at", "position_id", "sub_position_id", "created_at"),
+        Index("ix_production_logs_item_id_created_at", "item_id", "created_at"),
+        Index("ix_production_logs_supplier_id", "supplier_id"),
+        Index("ix_production_logs_approved_coordinator_by", "approved_coordinator_by"),
+        Index("ix_production_logs_approved_spv_by", "approved_spv_by"),
+        # Partial indexes covering only the logs still waiting for sign-off
+        Index(
+            "ix_production_logs_pending_coordinator", "shift_id", "created_at",
+            postgresql_where=text("approved_coordinator IS NOT true")
+        ),
+        Index(
+            "ix_production_logs_pending_spv", "shift_id", "created_at",
+            postgresql_where=text("approved_spv IS NOT true")
+        ),
         {"extend_existing": True}
     )
 
 
+class ProductionLogRollup(Base):
+    """Per day/shift/position/sub position/item/worker totals, kept in step with production_logs by app.rollup"""
+    __tablename__ = "production_log_rollups"
+
+    id = Column(BigInteger, primary_key=True)
+    log_date = Column(Date, nullable=False)
+    shift_id = Column(Integer, ForeignKey("shifts.id", ondelete="CASCADE"), nullable=False)
+    position_id = Column(Integer, ForeignKey("positions.id", ondelete="CASCADE"), nullable=False)
+    sub_position_id = Column(Integer, ForeignKey("sub_positions.id", ondelete="CASCADE"), nullable=True)
+    item_id = Column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    worker_id = Column(Integer, ForeignKey("workers.id", ondelete="CASCADE"), nullable=False)
+    qty_output = Column(Numeric(14, 2), nullable=False, default=0)
+    qty_reject = Column(Numeric(14, 2), nullable=False, default=0)
+    problem_duration_minutes = Column(BigInteger, nullable=False, default=0)
+    log_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # sub_position_id is nullable, so the key folds NULL into 0 to stay unique
+        Index(
+            "uq_production_log_rollups_key",
+            "log_date", "shift_id", "position_id", text("COALESCE(sub_position_id, 0)"), "item_id", "worker_id",
+            unique=True
+        ),
+        Index("ix_production_log_rollups_log_date_shift_id", "log_date", "shift_id"),
+    )
+
+
 class ProductionLogProblemComment(Base):
     __tablename__ = "production_log_problem_comments"
 
@@ -257,5 +334,51 @@ class ProductionLogProblemComment(Base):
     problem_comment = relationship("ProblemComment", back_populates="production_log_problem_comments")
 
     __table_args__ = (
+        Index("ix_production_log_problem_comments_production_log_id", "production_log_id", "problem_comment_id"),
+        Index("ix_production_log_problem_comments_problem_comment_id", "problem_comment_id"),
         {"extend_existing": True}
     )
+
+
+class Device(Base):
+    __tablename__ = "devices"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), unique=True, nullable=False)
+    host = Column(String(255), nullable=False)
+    port = Column(Integer, nullable=False)
+    group = Column(String(50), nullable=False, index=True)
+    # NULL falls back to DEVICE_POLL_INTERVAL / DEVICE_PROBE_TIMEOUT
+    probe_interval_seconds = Column(Integer, nullable=True)
+    probe_timeout_seconds = Column(Numeric(5, 2), nullable=True)
+    is_active = Column(Boolean, nullable=False, default=True, server_default=text("true"))
+
+    __table_args__ = (
+        CheckConstraint("port BETWEEN 1 AND 65535", name="devices_port_check"),
+        CheckConstraint("probe_interval_seconds > 0", name="devices_probe_interval_seconds_check"),
+        CheckConstraint("probe_timeout_seconds > 0", name="devices_probe_timeout_seconds_check"),
+    )
+
+
+class SyncChange(Base):
+    """Latest change of every reference row, maintained by the sync_changes_track() trigger"""
+    __tablename__ = "sync_changes"
+
+    version = Column(BigInteger, primary_key=True)
+    table_name = Column(String(50), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)
+    changed_at = Column(TIMESTAMP, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("operation IN ('upsert', 'delete')", name="sync_changes_operation_check"),
+        Index("uq_sync_changes_table_name_row_id", "table_name", "row_id", unique=True),
+    )
+
+
+class TableVersion(Base):
+    """Write counter per table, bumped by the table_versions_bump() statement trigger"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, server_default="0")
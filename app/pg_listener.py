@@ -0,0 +1,80 @@
+"""
+Shared Postgres LISTEN connection for this API process
+
+Modules register a handler per channel at import time; run_listener() keeps one
+dedicated connection (outside the SQLAlchemy pool) listening on all of them and
+calls the handlers on the event loop. Notifications sent while the connection was
+down are lost, so reconnect hooks let modules resynchronise.
+"""
+import asyncio
+import logging
+from typing import Callable, Optional
+import psycopg2
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_SECONDS = 5
+
+_handlers: dict[str, Callable[[str], None]] = {}
+_connect_hooks: list[Callable[[], None]] = []
+
+
+def register(channel: str, handler: Callable[[str], None]):
+    """Call handler(payload) for every NOTIFY on channel"""
+    _handlers[channel] = handler
+
+
+def on_connect(hook: Callable[[], None]):
+    """Call hook() every time the listener (re)connects"""
+    _connect_hooks.append(hook)
+
+
+def _connect():
+    """Dedicated autocommit connection listening on every registered channel"""
+    cargs, cparams = engine.dialect.create_connect_args(engine.url)
+    connection = psycopg2.connect(*cargs, **cparams)
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        for channel in _handlers:
+            cursor.execute(f"LISTEN {channel}")
+    return connection
+
+
+async def run_listener():
+    """Dispatch notifications to the registered handlers until cancelled, reconnecting on errors"""
+    loop = asyncio.get_running_loop()
+    while True:
+        connection = None
+        lost: Optional[asyncio.Future] = None
+        try:
+            connection = await asyncio.to_thread(_connect)
+            lost = loop.create_future()
+            for hook in _connect_hooks:
+                hook()
+
+            def on_readable():
+                try:
+                    connection.poll()
+                except Exception as exc:
+                    if not lost.done():
+                        lost.set_exception(exc)
+                    return
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    try:
+                        _handlers[notify.channel](notify.payload)
+                    except Exception:
+                        logger.exception("Handler for %s failed", notify.channel)
+
+            loop.add_reader(connection.fileno(), on_readable)
+            await lost
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Postgres listener lost its connection, reconnecting")
+        finally:
+            if connection is not None:
+                loop.remove_reader(connection.fileno())
+                connection.close()
+        await asyncio.sleep(RECONNECT_SECONDS)
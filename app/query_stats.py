@@ -0,0 +1,132 @@
+"""
+Per-request SQL statement counts and time, to catch N+1 query patterns
+
+instrument() hooks an engine's cursor events. QueryStatsMiddleware opens a fresh
+QueryStats for every request in a context variable. Sync handlers run in the
+threadpool with a copy of the request's context, and AsyncSession runs in the
+request's own task, so queries from either are counted. So are lazy loads
+triggered while the response is serialized.
+
+When a request finishes, any statement that ran more than
+DB_REPEATED_QUERY_THRESHOLD times is logged as a warning. With DEBUG enabled,
+responses carry X-DB-Queries (statement count) and X-DB-Time (milliseconds).
+Streamed responses send their headers first, so for them the headers only cover
+the queries made before the first chunk.
+"""
+import os
+import time
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+DEBUG = os.getenv("DEBUG", "").strip().lower() in {"1", "true", "yes"}
+REPEATED_QUERY_THRESHOLD = int(os.getenv("DB_REPEATED_QUERY_THRESHOLD", "10"))
+
+
+class QueryStats:
+    """Statements run during one request, or inside one assert_max_queries() block"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements that ran more than threshold times, most frequent first"""
+        return [(statement, n) for statement, n in self.statements.most_common() if n > threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# Open assert_max_queries() blocks. They see every statement, whatever thread or
+# context it runs in, because TestClient runs the app in a thread of its own.
+_captures: list[QueryStats] = []
+
+
+def _shape(statement: str) -> str:
+    # Parameters are already bound separately; only the formatting can differ
+    return " ".join(statement.split())
+
+
+def instrument(engine: Engine):
+    """Count every statement the engine runs into the current request's QueryStats"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context.query_started
+        stats = _current.get()
+        if stats is None and not _captures:
+            return
+        shape = _shape(statement)
+        if stats is not None:
+            stats.record(shape, seconds)
+        for capture in _captures:
+            capture.record(shape, seconds)
+
+
+class QueryStatsMiddleware:
+    """Opens a QueryStats for each HTTP request and reports on it when the request ends"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-queries", str(stats.count).encode()),
+                    (b"x-db-time", f"{stats.seconds * 1000:.1f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if DEBUG else send)
+        finally:
+            _current.reset(token)
+            for statement, n in stats.repeated(REPEATED_QUERY_THRESHOLD):
+                route = getattr(scope.get("route"), "path", scope["path"])
+                logger.warning(
+                    f"Possible N+1: {scope['method']} {route} ran the same statement {n} times: "
+                    f"{statement[:300]}"
+                )
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """Fail when the block runs more than max_queries statements
+
+        with assert_max_queries(4):
+            response = client.get("/workers/1")
+    """
+    stats = QueryStats()
+    _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        _captures.remove(stats)
+    if stats.count > max_queries:
+        statements = "\n".join(f"  {n}x {statement[:200]}" for statement, n in stats.statements.most_common(10))
+        raise AssertionError(f"Expected at most {max_queries} queries, {stats.count} ran:\n{statements}")
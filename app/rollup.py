@@ -0,0 +1,149 @@
+"""
+Incremental maintenance of the production_log_rollups table
+
+Every write path that changes production log quantities feeds the old and new
+values through apply_rollup_deltas() in the same transaction, so the rollups
+always agree with production_logs. rebuild_rollups() recomputes them from scratch.
+"""
+from decimal import Decimal
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from app import models
+
+KEY_FIELDS = ("log_date", "shift_id", "position_id", "sub_position_id", "item_id", "worker_id")
+
+
+def rollup_values(log) -> dict:
+    """
+    Extract the rollup key and measures from a ProductionLog (or a dict with the same fields)
+
+    Args:
+        log: ProductionLog instance or mapping with created_at, key columns and quantities
+
+    Returns:
+        Dict with the rollup key fields and qty_output, qty_reject, problem_duration_minutes
+    """
+    get = log.get if isinstance(log, dict) else lambda field: getattr(log, field)
+    return {
+        "log_date": get("created_at").date(),
+        "shift_id": get("shift_id"),
+        "position_id": get("position_id"),
+        "sub_position_id": get("sub_position_id"),
+        "item_id": get("item_id"),
+        "worker_id": get("worker_id"),
+        "qty_output": Decimal(str(get("qty_output"))),
+        "qty_reject": Decimal(str(get("qty_reject"))),
+        "problem_duration_minutes": get("problem_duration_minutes") or 0,
+    }
+
+
+def apply_rollup_deltas(db: Session, deltas: list[tuple[dict, int]]) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) production log values from their rollup rows
+
+    Deltas sharing a key are merged first, so the whole batch costs one upsert, plus
+    one delete when a rollup row no longer covers any log.
+
+    Args:
+        db: Database session, committed by the caller
+        deltas: (rollup_values(...), sign) pairs
+    """
+    merged: dict[tuple, dict] = {}
+    for values, sign in deltas:
+        key = tuple(values[field] for field in KEY_FIELDS)
+        row = merged.setdefault(key, {
+            **dict(zip(KEY_FIELDS, key)),
+            "qty_output": Decimal(0),
+            "qty_reject": Decimal(0),
+            "problem_duration_minutes": 0,
+            "log_count": 0,
+        })
+        row["qty_output"] += sign * values["qty_output"]
+        row["qty_reject"] += sign * values["qty_reject"]
+        row["problem_duration_minutes"] += sign * values["problem_duration_minutes"]
+        row["log_count"] += sign
+
+    # Skip no-op deltas and lock rows in key order so concurrent batches cannot deadlock
+    rows = [
+        row for _, row in sorted(merged.items(), key=lambda entry: tuple(part or 0 for part in entry[0]))
+        if row["log_count"] or row["qty_output"] or row["qty_reject"] or row["problem_duration_minutes"]
+    ]
+    if not rows:
+        return
+
+    rollup = models.ProductionLogRollup.__table__
+    statement = pg_insert(rollup).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[
+            rollup.c.log_date, rollup.c.shift_id, rollup.c.position_id,
+            func.coalesce(rollup.c.sub_position_id, 0), rollup.c.item_id, rollup.c.worker_id,
+        ],
+        set_={
+            "qty_output": rollup.c.qty_output + statement.excluded.qty_output,
+            "qty_reject": rollup.c.qty_reject + statement.excluded.qty_reject,
+            "problem_duration_minutes": rollup.c.problem_duration_minutes + statement.excluded.problem_duration_minutes,
+            "log_count": rollup.c.log_count + statement.excluded.log_count,
+        }
+    ).returning(rollup.c.id, rollup.c.log_count)
+
+    emptied_ids = [rollup_id for rollup_id, log_count in db.execute(statement) if log_count <= 0]
+    if emptied_ids:
+        db.execute(delete(rollup).where(rollup.c.id.in_(emptied_ids)))
+
+
+def subtract_logs(db: Session, *conditions) -> None:
+    """
+    Remove the production logs matching conditions from the rollups
+
+    For logs deleted by an ORM cascade, e.g. a supplier's, which no handler sees
+    one by one; run it before the parent is deleted.
+
+    Args:
+        db: Database session, committed by the caller
+        conditions: WHERE clauses on ProductionLog
+    """
+    log = models.ProductionLog
+    rows = db.execute(
+        select(
+            log.created_at, log.shift_id, log.position_id, log.sub_position_id, log.item_id, log.worker_id,
+            log.qty_output, log.qty_reject, log.problem_duration_minutes,
+        ).where(*conditions)
+    ).mappings()
+    apply_rollup_deltas(db, [(rollup_values(dict(row)), -1) for row in rows])
+
+
+def rebuild_rollups(db: Session) -> int:
+    """
+    Recompute every rollup row from production_logs
+
+    Args:
+        db: Database session, committed by the caller
+
+    Returns:
+        Number of rollup rows written
+    """
+    log = models.ProductionLog
+    rollup = models.ProductionLogRollup.__table__
+    log_date = func.date(log.created_at)
+    aggregated = select(
+        log_date,
+        log.shift_id,
+        log.position_id,
+        log.sub_position_id,
+        log.item_id,
+        log.worker_id,
+        func.sum(log.qty_output),
+        func.sum(log.qty_reject),
+        func.coalesce(func.sum(log.problem_duration_minutes), 0),
+        func.count(),
+    ).group_by(log_date, log.shift_id, log.position_id, log.sub_position_id, log.item_id, log.worker_id)
+
+    # Serialize with concurrent incremental updates while the table is rebuilt
+    db.execute(text("LOCK TABLE production_log_rollups IN EXCLUSIVE MODE"))
+    db.execute(delete(rollup))
+    result = db.execute(insert(rollup).from_select(
+        [*KEY_FIELDS, "qty_output", "qty_reject", "problem_duration_minutes", "log_count"],
+        aggregated
+    ))
+    return result.rowcount
@@ -1,23 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
-from app.database import get_db
-from app import models, schemas
+from app.database import get_db, get_read_db
+from app import etag, models, schemas
+from app.validators import validate_foreign_keys
 
 router = APIRouter(prefix="/attendances", tags=["Attendances"])
 
+# Tables behind the GET responses, embedded relations included
+etag_models = (
+    models.Attendance, models.Worker, models.Position, models.Department, models.Division,
+)
+response_etag = Depends(etag.conditional(*etag_models))
 
-@router.get("", response_model=list[schemas.AttendanceResponse])
-@router.get("/", response_model=list[schemas.AttendanceResponse])
-def get_attendances(db: Session = Depends(get_db)):
+
+@router.get("", response_model=list[schemas.AttendanceResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.AttendanceResponse], dependencies=[response_etag])
+def get_attendances(db: Session = Depends(get_read_db)):
     """Get all attendances"""
     return db.query(models.Attendance)\
         .options(joinedload(models.Attendance.worker))\
         .all()
 
 
-@router.get("/{attendance_id}", response_model=schemas.AttendanceResponse)
-@router.get("/{attendance_id}/", response_model=schemas.AttendanceResponse)
-def get_attendance(attendance_id: int, db: Session = Depends(get_db)):
+@router.get("/{attendance_id}", response_model=schemas.AttendanceResponse, dependencies=[response_etag])
+@router.get("/{attendance_id}/", response_model=schemas.AttendanceResponse, dependencies=[response_etag])
+def get_attendance(attendance_id: int, db: Session = Depends(get_read_db)):
     """Get an attendance by ID"""
     attendance = db.query(models.Attendance)\
         .options(joinedload(models.Attendance.worker))\
@@ -34,9 +41,7 @@ def create_attendance(data: schemas.AttendanceCreate, db: Session = Depends(get_
     """Create a new attendance record"""
     try:
         # Validate worker exists
-        worker = db.query(models.Worker).filter(models.Worker.id == data.worker_id).first()
-        if not worker:
-            raise HTTPException(status_code=404, detail="Worker tidak ditemukan")
+        validate_foreign_keys(db, [(models.Worker, data.worker_id, "Worker tidak ditemukan")])
 
         new_attendance = models.Attendance(**data.model_dump())
         db.add(new_attendance)
@@ -63,10 +68,7 @@ def update_attendance(attendance_id: int, data: schemas.AttendanceUpdate, db: Se
         raise HTTPException(status_code=404, detail="Attendance tidak ditemukan")
     
     # Validate worker if changed
-    if data.worker_id is not None:
-        worker = db.query(models.Worker).filter(models.Worker.id == data.worker_id).first()
-        if not worker:
-            raise HTTPException(status_code=404, detail="Worker tidak ditemukan")
+    validate_foreign_keys(db, [(models.Worker, data.worker_id, "Worker tidak ditemukan")])
 
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
@@ -0,0 +1,106 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.database import get_async_db, get_async_read_db
+from app import etag, models, schemas
+from app.routers.attendance import etag_models
+from app.validators import validate_foreign_keys
+
+# Async version of app.routers.attendance, used when DB_ASYNC is enabled
+router = APIRouter(prefix="/attendances", tags=["Attendances"])
+
+response_etag = Depends(etag.conditional_async(*etag_models))
+
+# Everything AttendanceResponse renders; nothing may be lazy loaded on the event loop
+ATTENDANCE_RELATIONS = (
+    joinedload(models.Attendance.worker).joinedload(models.Worker.position),
+    joinedload(models.Attendance.worker).joinedload(models.Worker.department).joinedload(models.Department.division),
+)
+
+
+async def _load_attendance(db: AsyncSession, attendance_id: int):
+    result = await db.execute(
+        select(models.Attendance)
+        .options(*ATTENDANCE_RELATIONS)
+        .where(models.Attendance.id == attendance_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+
+@router.get("", response_model=list[schemas.AttendanceResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.AttendanceResponse], dependencies=[response_etag])
+async def get_attendances(db: AsyncSession = Depends(get_async_read_db)):
+    """Get all attendances"""
+    result = await db.execute(select(models.Attendance).options(*ATTENDANCE_RELATIONS))
+    return result.scalars().all()
+
+
+@router.get("/{attendance_id:int}", response_model=schemas.AttendanceResponse, dependencies=[response_etag])
+@router.get("/{attendance_id:int}/", response_model=schemas.AttendanceResponse, dependencies=[response_etag])
+async def get_attendance(attendance_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Get an attendance by ID"""
+    attendance = await _load_attendance(db, attendance_id)
+    if not attendance:
+        raise HTTPException(status_code=404, detail="Attendance tidak ditemukan")
+    return attendance
+
+
+@router.post("", response_model=schemas.AttendanceResponse, status_code=201)
+@router.post("/", response_model=schemas.AttendanceResponse, status_code=201)
+async def create_attendance(data: schemas.AttendanceCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new attendance record"""
+    try:
+        # Validate worker exists
+        await db.run_sync(validate_foreign_keys, [(models.Worker, data.worker_id, "Worker tidak ditemukan")])
+
+        new_attendance = models.Attendance(**data.model_dump())
+        db.add(new_attendance)
+        await db.commit()
+        return await _load_attendance(db, new_attendance.id)
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error creating attendance: {str(e)}")
+
+
+@router.put("/{attendance_id:int}", response_model=schemas.AttendanceResponse)
+@router.put("/{attendance_id:int}/", response_model=schemas.AttendanceResponse)
+async def update_attendance(attendance_id: int, data: schemas.AttendanceUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Update an attendance record"""
+    attendance = await db.get(models.Attendance, attendance_id)
+    if not attendance:
+        raise HTTPException(status_code=404, detail="Attendance tidak ditemukan")
+
+    # Validate worker if changed
+    await db.run_sync(validate_foreign_keys, [(models.Worker, data.worker_id, "Worker tidak ditemukan")])
+
+    update_data = data.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(attendance, field, value)
+
+    try:
+        await db.commit()
+        return await _load_attendance(db, attendance.id)
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error updating attendance: {str(e)}")
+
+
+@router.delete("/{attendance_id:int}")
+@router.delete("/{attendance_id:int}/")
+async def delete_attendance(attendance_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete an attendance record"""
+    attendance = await db.get(models.Attendance, attendance_id)
+    if not attendance:
+        raise HTTPException(status_code=404, detail="Attendance tidak ditemukan")
+
+    try:
+        await db.delete(attendance)
+        await db.commit()
+        return {"message": "Attendance berhasil dihapus"}
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error deleting attendance: {str(e)}")
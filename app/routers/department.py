@@ -2,22 +2,27 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from app.database import get_db
-from app import models, schemas
+from app import cache, etag, models, schemas
 
 router = APIRouter(prefix="/departments", tags=["Departments"])
 
+# Tables behind the GET responses, embedded relations included. Read from the
+# primary like the cached list they tag.
+response_etag = Depends(etag.conditional(models.Department, models.Division, get_session=get_db))
 
-@router.get("", response_model=list[schemas.DepartmentResponse])
-@router.get("/", response_model=list[schemas.DepartmentResponse])
+
+@router.get("", response_model=list[schemas.DepartmentResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.DepartmentResponse], dependencies=[response_etag])
 def get_departments(db: Session = Depends(get_db)):
     """Get all departments with their division information"""
-    return db.query(models.Department)\
-        .options(joinedload(models.Department.division))\
-        .all()
+    return cache.get("departments", "list", lambda: [
+        schemas.DepartmentResponse.model_validate(department)
+        for department in db.query(models.Department).options(joinedload(models.Department.division)).all()
+    ])
 
 
-@router.get("/{department_id}", response_model=schemas.DepartmentResponse)
-@router.get("/{department_id}/", response_model=schemas.DepartmentResponse)
+@router.get("/{department_id}", response_model=schemas.DepartmentResponse, dependencies=[response_etag])
+@router.get("/{department_id}/", response_model=schemas.DepartmentResponse, dependencies=[response_etag])
 def get_department(department_id: int, db: Session = Depends(get_db)):
     """Get a department by ID with division information"""
     department = db.query(models.Department)\
@@ -29,14 +34,11 @@ def get_department(department_id: int, db: Session = Depends(get_db)):
     return department
 
 
-@router.get("/by-division/{division_id}", response_model=list[schemas.DepartmentResponse])
-@router.get("/by-division/{division_id}/", response_model=list[schemas.DepartmentResponse])
+@router.get("/by-division/{division_id}", response_model=list[schemas.DepartmentResponse], dependencies=[response_etag])
+@router.get("/by-division/{division_id}/", response_model=list[schemas.DepartmentResponse], dependencies=[response_etag])
 def get_departments_by_division(division_id: int, db: Session = Depends(get_db)):
     """Get all departments by division ID"""
-    return db.query(models.Department)\
-        .options(joinedload(models.Department.division))\
-        .filter(models.Department.division_id == division_id)\
-        .all()
+    return [department for department in get_departments(db) if department.division_id == division_id]
 
 
 @router.post("", response_model=schemas.DepartmentResponse, status_code=201)
@@ -62,6 +64,7 @@ def create_department(data: schemas.DepartmentCreate, db: Session = Depends(get_
 
     department = models.Department(**data.model_dump())
     db.add(department)
+    cache.invalidate(db, "departments")
     db.commit()
     db.refresh(department)
     
@@ -107,6 +110,7 @@ def update_department(department_id: int, data: schemas.DepartmentUpdate, db: Se
     for field, value in update_data.items():
         setattr(department, field, value)
     
+    cache.invalidate(db, "departments")
     db.commit()
     db.refresh(department)
     
@@ -128,6 +132,7 @@ def delete_department(department_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Department tidak ditemukan")
     
     db.delete(department)
+    cache.invalidate(db, "departments")
     try:
         db.commit()
     except IntegrityError:
@@ -1,85 +1,142 @@
-from fastapi import APIRouter
-import socket
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+import time
+from app.database import get_db
+from app import device_poller, models, schemas
 
 router = APIRouter(
     prefix="/devices",
     tags=["Device Monitor"]
 )
 
-# Daftar perangkat dari file listFp&DVR.txt
-DEVICES = [
-    # Fingerprints
-    {"name": "FP OFFICE (Local)", "host": "172.16.0.18", "port": 4370, "group": "Fingerprint"},
-    {"name": "FP OFFICE (Public)", "host": "103.164.99.2", "port": 4, "group": "Fingerprint"},
-    
-    {"name": "FP KAWAT (Local)", "host": "172.16.0.17", "port": 4370, "group": "Fingerprint"},
-    {"name": "FP KAWAT (Public)", "host": "103.164.99.2", "port": 3, "group": "Fingerprint"},
-    
-    {"name": "FP ACS/QCR (Local)", "host": "172.16.0.16", "port": 4370, "group": "Fingerprint"},
-    {"name": "FP ACS/QCR (Public)", "host": "103.164.99.2", "port": 2, "group": "Fingerprint"},
-    
-    {"name": "FP PRINTSEWING/QC (Local)", "host": "172.16.0.15", "port": 4370, "group": "Fingerprint"},
-    {"name": "FP PRINTSEWING/QC (Public)", "host": "103.164.99.2", "port": 1, "group": "Fingerprint"},
-    
-    {"name": "FP PEKANBARU", "host": "103.183.14.82", "port": 11043, "group": "Fingerprint"},
-
-    # DVRs
-    {"name": "DVR HRD BEKASI", "host": "103.164.99.2", "port": 11011, "group": "DVR"},
-    {"name": "DVR PPIC BEKASI", "host": "103.164.99.2", "port": 11012, "group": "DVR"},
-    {"name": "DVR SECURITY BEKASI", "host": "103.164.99.2", "port": 11013, "group": "DVR"},
-    {"name": "DVR PRODUKSI 1 BEKASI", "host": "103.164.99.2", "port": 11014, "group": "DVR"},
-    {"name": "DVR GUDANG JADI BEKASI", "host": "103.164.99.2", "port": 11015, "group": "DVR"},
-    {"name": "DVR PRODUKSI 2 BEKASI", "host": "103.164.99.2", "port": 11016, "group": "DVR"}, # Asumsi baris 35 adalah unit ke-2
-    {"name": "DVR KAWAT BEKASI", "host": "103.164.99.2", "port": 11017, "group": "DVR"},
-    {"name": "DVR ICU + BANTAL BEKASI", "host": "103.164.99.2", "port": 11018, "group": "DVR"},
-    
-    {"name": "DVR PRODUKSI BANDUNG", "host": "36.93.215.10", "port": 11021, "group": "DVR"},
-    {"name": "DVR OFFICE BANDUNG", "host": "36.93.215.10", "port": 11022, "group": "DVR"},
-    
-    {"name": "DVR OFFICE PEKANBARU", "host": "103.183.14.82", "port": 11042, "group": "DVR"},
-    {"name": "DVR PRODUKSI PEKANBARU", "host": "103.183.14.82", "port": 11041, "group": "DVR"},
-]
-
-def check_connection(host: str, port: int, timeout: int = 2) -> bool:
-    """Check if a TCP port is open"""
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.settimeout(timeout)
-            result = sock.connect_ex((host, port))
-            return result == 0
-    except Exception:
-        return False
-
 @router.get("/status")
-async def get_devices_status():
-    loop = asyncio.get_running_loop()
-    
-    # Gunakan ThreadPoolExecutor untuk menjalankan socket blocking secara paralel
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        futures = []
-        for device in DEVICES:
-            futures.append(
-                loop.run_in_executor(
-                    executor, 
-                    check_connection, 
-                    device["host"], 
-                    device["port"]
-                )
-            )
-        
-        results = await asyncio.gather(*futures)
-    
-    # Gabungkan hasil dengan data device
-    response_data = []
-    for i, device in enumerate(DEVICES):
-        response_data.append({
-            "name": device["name"],
-            "host": device["host"],
-            "port": device["port"],
-            "group": device["group"],
-            "status": "online" if results[i] else "offline"
-        })
-        
-    return response_data
+async def get_devices_status(group: Optional[str] = Query(default=None)):
+    # Status dibaca dari cache poller di background, bukan diprobe per request
+    return [device_poller.describe(device) for device in device_poller.registry(group)]
+
+@router.get("/{name:path}/history")
+async def get_device_history(
+    name: str,
+    hours: int = Query(default=24, ge=1, le=168)
+):
+    """
+    Uptime percentage and outage intervals of one device over the last `hours`
+    """
+    device = next((device for device in device_poller.registry() if device["name"] == name), None)
+    if not device:
+        raise HTTPException(status_code=404, detail="Device tidak ditemukan")
+
+    end = time.time()
+    # Perangkat yang belum pernah diprobe punya riwayat kosong
+    state = device_poller.get_state(device["id"]) or device_poller.DeviceState(name)
+    return {
+        "name": device["name"],
+        "group": device["group"],
+        "status": state.status or "unknown",
+        "window_hours": hours,
+        **state.history(end - hours * 3600, end)
+    }
+
+
+def _device_value_error(data) -> Optional[str]:
+    """Mirror the devices CHECK constraints so bad input gets a clear 400"""
+    if data.port is not None and not 1 <= data.port <= 65535:
+        return "port harus antara 1 dan 65535"
+    if data.probe_interval_seconds is not None and data.probe_interval_seconds <= 0:
+        return "probe_interval_seconds harus lebih dari 0"
+    if data.probe_timeout_seconds is not None and data.probe_timeout_seconds <= 0:
+        return "probe_timeout_seconds harus lebih dari 0"
+    return None
+
+
+@router.get("", response_model=list[schemas.DeviceResponse])
+@router.get("/", response_model=list[schemas.DeviceResponse])
+def get_devices(group: Optional[str] = Query(default=None), db: Session = Depends(get_db)):
+    """Get all registered devices, optionally filtered by group"""
+    query = db.query(models.Device)
+    if group:
+        query = query.filter(models.Device.group == group)
+    return query.order_by(models.Device.id).all()
+
+
+@router.get("/{device_id}", response_model=schemas.DeviceResponse)
+@router.get("/{device_id}/", response_model=schemas.DeviceResponse)
+def get_device(device_id: int, db: Session = Depends(get_db)):
+    """Get a device by ID"""
+    device = db.query(models.Device)\
+        .filter(models.Device.id == device_id)\
+        .first()
+    if not device:
+        raise HTTPException(status_code=404, detail="Device tidak ditemukan")
+    return device
+
+
+@router.post("", response_model=schemas.DeviceResponse, status_code=201)
+@router.post("/", response_model=schemas.DeviceResponse, status_code=201)
+def create_device(data: schemas.DeviceCreate, db: Session = Depends(get_db)):
+    """Register a new device; the poller picks it up immediately"""
+    error = _device_value_error(data)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    exists = db.query(models.Device)\
+        .filter(models.Device.name == data.name)\
+        .first()
+    if exists:
+        raise HTTPException(status_code=400, detail="Device sudah ada")
+
+    device = models.Device(**data.model_dump())
+    db.add(device)
+    db.commit()
+    db.refresh(device)
+    device_poller.request_reload()
+    return device
+
+
+@router.put("/{device_id}", response_model=schemas.DeviceResponse)
+@router.put("/{device_id}/", response_model=schemas.DeviceResponse)
+def update_device(device_id: int, data: schemas.DeviceUpdate, db: Session = Depends(get_db)):
+    """Update a device; the poller reschedules it immediately"""
+    device = db.query(models.Device)\
+        .filter(models.Device.id == device_id)\
+        .first()
+    if not device:
+        raise HTTPException(status_code=404, detail="Device tidak ditemukan")
+
+    error = _device_value_error(data)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    # Check if new name conflicts with existing
+    if data.name and data.name != device.name:
+        exists = db.query(models.Device)\
+            .filter(models.Device.name == data.name)\
+            .first()
+        if exists:
+            raise HTTPException(status_code=400, detail="Device name sudah ada")
+
+    update_data = data.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(device, field, value)
+
+    db.commit()
+    db.refresh(device)
+    device_poller.request_reload()
+    return device
+
+
+@router.delete("/{device_id}")
+@router.delete("/{device_id}/")
+def delete_device(device_id: int, db: Session = Depends(get_db)):
+    """Delete a device and stop polling it"""
+    device = db.query(models.Device)\
+        .filter(models.Device.id == device_id)\
+        .first()
+    if not device:
+        raise HTTPException(status_code=404, detail="Device tidak ditemukan")
+
+    db.delete(device)
+    db.commit()
+    device_poller.request_reload()
+    return {"message": "Device berhasil dihapus"}
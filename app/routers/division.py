@@ -2,20 +2,27 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from app.database import get_db
-from app import models, schemas
+from app import cache, etag, models, schemas
 
 router = APIRouter(prefix="/divisions", tags=["Divisions"])
 
+# Tables behind the GET responses, embedded relations included. Read from the
+# primary like the cached list they tag.
+response_etag = Depends(etag.conditional(models.Division, get_session=get_db))
 
-@router.get("", response_model=list[schemas.DivisionResponse])
-@router.get("/", response_model=list[schemas.DivisionResponse])
+
+@router.get("", response_model=list[schemas.DivisionResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.DivisionResponse], dependencies=[response_etag])
 def get_divisions(db: Session = Depends(get_db)):
     """Get all divisions"""
-    return db.query(models.Division).all()
+    return cache.get("divisions", "list", lambda: [
+        schemas.DivisionResponse.model_validate(division)
+        for division in db.query(models.Division).all()
+    ])
 
 
-@router.get("/{division_id}", response_model=schemas.DivisionResponse)
-@router.get("/{division_id}/", response_model=schemas.DivisionResponse)
+@router.get("/{division_id}", response_model=schemas.DivisionResponse, dependencies=[response_etag])
+@router.get("/{division_id}/", response_model=schemas.DivisionResponse, dependencies=[response_etag])
 def get_division(division_id: int, db: Session = Depends(get_db)):
     """Get a division by ID"""
     division = db.query(models.Division)\
@@ -46,6 +53,7 @@ def create_division(data: schemas.DivisionCreate, db: Session = Depends(get_db))
 
     division = models.Division(**data.model_dump())
     db.add(division)
+    cache.invalidate(db, "divisions")
     db.commit()
     db.refresh(division)
     return division
@@ -81,6 +89,7 @@ def update_division(division_id: int, data: schemas.DivisionUpdate, db: Session
     for field, value in update_data.items():
         setattr(division, field, value)
     
+    cache.invalidate(db, "divisions")
     db.commit()
     db.refresh(division)
     return division
@@ -97,6 +106,7 @@ def delete_division(division_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Division tidak ditemukan")
     
     db.delete(division)
+    cache.invalidate(db, "divisions")
     try:
         db.commit()
     except IntegrityError:
@@ -2,20 +2,29 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.database import get_db
-from app import models, schemas
+from app import cache, etag, models, schemas
+from app.log_feed import notify_cascaded_deletes
 
 router = APIRouter(prefix="/items", tags=["Items"])
 
+# Tables behind the GET responses, embedded relations included
+# Items stay on the primary: the cached list is invalidated by primary commits
+# and must not be refilled from a replica that has not replayed them yet
+response_etag = Depends(etag.conditional(models.Item, get_session=get_db))
 
-@router.get("", response_model=list[schemas.ItemResponse])
-@router.get("/", response_model=list[schemas.ItemResponse])
+
+@router.get("", response_model=list[schemas.ItemResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.ItemResponse], dependencies=[response_etag])
 def get_items(db: Session = Depends(get_db)):
     """Get all items"""
-    return db.query(models.Item).all()
+    return cache.get("items", "list", lambda: [
+        schemas.ItemResponse.model_validate(item)
+        for item in db.query(models.Item).all()
+    ])
 
 
-@router.get("/{item_identifier}", response_model=schemas.ItemResponse)
-@router.get("/{item_identifier}/", response_model=schemas.ItemResponse)
+@router.get("/{item_identifier}", response_model=schemas.ItemResponse, dependencies=[response_etag])
+@router.get("/{item_identifier}/", response_model=schemas.ItemResponse, dependencies=[response_etag])
 def get_item_by_id_or_number(item_identifier: str, db: Session = Depends(get_db)):
     """Get an item by ID (integer) or item_number (string)"""
     # Try to parse as integer first (for backward compatibility with ID lookup)
@@ -38,8 +47,8 @@ def get_item_by_id_or_number(item_identifier: str, db: Session = Depends(get_db)
     return item
 
 
-@router.get("/number/{item_number}", response_model=schemas.ItemResponse)
-@router.get("/number/{item_number}/", response_model=schemas.ItemResponse)
+@router.get("/number/{item_number}", response_model=schemas.ItemResponse, dependencies=[response_etag])
+@router.get("/number/{item_number}/", response_model=schemas.ItemResponse, dependencies=[response_etag])
 def get_item(item_number: str, db: Session = Depends(get_db)):
     """Get an item by item number"""
     item = db.query(models.Item)\
@@ -63,6 +72,7 @@ def create_item(data: schemas.ItemCreate, db: Session = Depends(get_db)):
     
     item = models.Item(**data.model_dump())
     db.add(item)
+    cache.invalidate(db, "items")
     db.commit()
     db.refresh(item)
     return item
@@ -90,6 +100,7 @@ def update_item(item_id: int, data: schemas.ItemUpdate, db: Session = Depends(ge
     for field, value in update_data.items():
         setattr(item, field, value)
     
+    cache.invalidate(db, "items")
     db.commit()
     db.refresh(item)
     return item
@@ -105,7 +116,9 @@ def delete_item(item_id: int, db: Session = Depends(get_db)):
     if not item:
         raise HTTPException(status_code=404, detail="Item tidak ditemukan")
     
+    notify_cascaded_deletes(db, models.ProductionLog.item_id == item_id)
     db.delete(item)
+    cache.invalidate(db, "items")
     try:
         db.commit()
     except IntegrityError:
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from app import http_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics")
+def get_metrics():
+    """Request counts, status codes, latency histograms and in-flight gauges in Prometheus text format"""
+    body, content_type = http_metrics.render()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app import device_poller, system_sampler
+from app.events import monitor_events, sse_stream
+
+router = APIRouter(
+    prefix="/monitor",
+    tags=["Monitor Events"]
+)
+
+@router.get("/events")
+async def stream_monitor_events(group: Optional[str] = Query(default=None)):
+    """
+    Server-Sent Events stream of device and system status changes
+
+    The first event is a full "snapshot" (devices and system status), followed only by
+    deltas: "device" when a device goes online/offline, "device_removed", "system" when
+    CPU, memory or disk crosses its alert threshold and "service" when a watched
+    service starts or stops. `group` limits device events to one device group.
+    """
+    def snapshot():
+        return [("snapshot", {
+            "devices": [device_poller.describe(device) for device in device_poller.registry(group)],
+            "system": system_sampler.latest_snapshot(),
+        })]
+
+    def accept(event_type: str, data: dict) -> bool:
+        return group is None or event_type not in ("device", "device_removed") or data.get("group", group) == group
+
+    return StreamingResponse(
+        sse_stream(monitor_events, snapshot, accept),
+        media_type="text/event-stream",
+        # Keep nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,20 +2,28 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.database import get_db
-from app import models, schemas
+from app import cache, etag, models, schemas
+from app.log_feed import notify_cascaded_deletes
 
 router = APIRouter(prefix="/positions", tags=["Positions"])
 
+# Tables behind the GET responses, embedded relations included. Read from the
+# primary like the cached list they tag.
+response_etag = Depends(etag.conditional(models.Position, get_session=get_db))
 
-@router.get("", response_model=list[schemas.PositionResponse])
-@router.get("/", response_model=list[schemas.PositionResponse])
+
+@router.get("", response_model=list[schemas.PositionResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.PositionResponse], dependencies=[response_etag])
 def get_positions(db: Session = Depends(get_db)):
     """Get all positions"""
-    return db.query(models.Position).all()
+    return cache.get("positions", "list", lambda: [
+        schemas.PositionResponse.model_validate(position)
+        for position in db.query(models.Position).all()
+    ])
 
 
-@router.get("/{position_id}", response_model=schemas.PositionResponse)
-@router.get("/{position_id}/", response_model=schemas.PositionResponse)
+@router.get("/{position_id}", response_model=schemas.PositionResponse, dependencies=[response_etag])
+@router.get("/{position_id}/", response_model=schemas.PositionResponse, dependencies=[response_etag])
 def get_position(position_id: int, db: Session = Depends(get_db)):
     """Get a position by ID"""
     position = db.query(models.Position)\
@@ -42,6 +50,7 @@ def create_position(data: schemas.PositionCreate, db: Session = Depends(get_db))
 
     position = models.Position(**data.model_dump())
     db.add(position)
+    cache.invalidate(db, "positions")
     db.commit()
     db.refresh(position)
     return position
@@ -72,6 +81,7 @@ def update_position(position_id: int, data: schemas.PositionUpdate, db: Session
     for field, value in update_data.items():
         setattr(position, field, value)
     
+    cache.invalidate(db, "positions")
     db.commit()
     db.refresh(position)
     return position
@@ -87,7 +97,9 @@ def delete_position(position_id: int, db: Session = Depends(get_db)):
     if not position:
         raise HTTPException(status_code=404, detail="Position tidak ditemukan")
     
+    notify_cascaded_deletes(db, models.ProductionLog.position_id == position_id)
     db.delete(position)
+    cache.invalidate(db, "positions")
     try:
         db.commit()
     except IntegrityError:
@@ -1,20 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app import models, schemas
+from app import cache, etag, models, schemas
 
 router = APIRouter(prefix="/problem-comments", tags=["Problem Comments"])
 
+# Tables behind the GET responses, embedded relations included. Read from the
+# primary like the cached list they tag.
+response_etag = Depends(etag.conditional(models.ProblemComment, get_session=get_db))
 
-@router.get("", response_model=list[schemas.ProblemCommentResponse])
-@router.get("/", response_model=list[schemas.ProblemCommentResponse])
+
+@router.get("", response_model=list[schemas.ProblemCommentResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.ProblemCommentResponse], dependencies=[response_etag])
 def get_comments(db: Session = Depends(get_db)):
     """Get all problem comments"""
-    return db.query(models.ProblemComment).all()
+    return cache.get("problem_comments", "list", lambda: [
+        schemas.ProblemCommentResponse.model_validate(comment)
+        for comment in db.query(models.ProblemComment).all()
+    ])
 
 
-@router.get("/{comment_id}", response_model=schemas.ProblemCommentResponse)
-@router.get("/{comment_id}/", response_model=schemas.ProblemCommentResponse)
+@router.get("/{comment_id}", response_model=schemas.ProblemCommentResponse, dependencies=[response_etag])
+@router.get("/{comment_id}/", response_model=schemas.ProblemCommentResponse, dependencies=[response_etag])
 def get_comment(comment_id: int, db: Session = Depends(get_db)):
     """Get a problem comment by ID"""
     comment = db.query(models.ProblemComment)\
@@ -38,6 +45,7 @@ def create_comment(data: schemas.ProblemCommentCreate, db: Session = Depends(get
     
     comment = models.ProblemComment(**data.model_dump())
     db.add(comment)
+    cache.invalidate(db, "problem_comments")
     db.commit()
     db.refresh(comment)
     return comment
@@ -65,6 +73,7 @@ def update_comment(comment_id: int, data: schemas.ProblemCommentUpdate, db: Sess
     for field, value in update_data.items():
         setattr(comment, field, value)
     
+    cache.invalidate(db, "problem_comments")
     db.commit()
     db.refresh(comment)
     return comment
@@ -81,6 +90,7 @@ def delete_comment(comment_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Problem comment tidak ditemukan")
     
     db.delete(comment)
+    cache.invalidate(db, "problem_comments")
     try:
         db.commit()
     except IntegrityError:
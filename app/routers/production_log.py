@@ -1,12 +1,251 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
-from sqlalchemy.orm import Session, joinedload, selectinload
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, WebSocket
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ARRAY, BigInteger, any_, func, insert, literal, select, tuple_, update
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload, sessionmaker
 from datetime import datetime
-from typing import List
-from app.database import get_db
+from decimal import Decimal
+from typing import List, Literal
+import base64
+import csv
+import io
+import json
+import math
+from app.database import get_db, get_read_db, read_sessionmaker
 from app import models, schemas
+from app.events import sse_stream, websocket_stream
+from app.log_feed import log_events, notify_log_changes
+from app.rollup import apply_rollup_deltas, rollup_values
+from app.validators import fetch_existing_ids, validate_foreign_keys
 
 router = APIRouter(prefix="/production-logs", tags=["Production Logs"])
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_CHUNK_SIZE = 1000
+
+
+def _with_relations(query):
+    """Eager-load every relationship rendered by ProductionLogResponse"""
+    return query.options(
+        joinedload(models.ProductionLog.worker).joinedload(models.Worker.position),
+        joinedload(models.ProductionLog.worker).joinedload(models.Worker.department).joinedload(models.Department.division),
+        joinedload(models.ProductionLog.position),
+        joinedload(models.ProductionLog.sub_position).joinedload(models.SubPosition.position),
+        joinedload(models.ProductionLog.shift),
+        joinedload(models.ProductionLog.supplier),
+        joinedload(models.ProductionLog.item),
+        joinedload(models.ProductionLog.approved_coordinator_by_worker),
+        joinedload(models.ProductionLog.approved_spv_by_worker),
+        selectinload(models.ProductionLog.production_log_problem_comments).joinedload(models.ProductionLogProblemComment.problem_comment)
+    )
+
+
+def _log_filters(
+    created_from: datetime | None = Query(default=None, description="Inclusive lower bound on created_at"),
+    created_to: datetime | None = Query(default=None, description="Exclusive upper bound on created_at"),
+    shift_id: int | None = Query(default=None),
+    worker_id: int | None = Query(default=None),
+    position_id: int | None = Query(default=None),
+    sub_position_id: int | None = Query(default=None),
+    item_id: int | None = Query(default=None),
+    approved_coordinator: bool | None = Query(default=None, description="false also matches logs not yet reviewed"),
+    approved_spv: bool | None = Query(default=None, description="false also matches logs not yet reviewed"),
+    status_completion: int | None = Query(default=None),
+) -> list:
+    """Collect the production log query-string filters as SQL conditions"""
+    conditions = []
+    if created_from is not None:
+        conditions.append(models.ProductionLog.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(models.ProductionLog.created_at < created_to)
+    if shift_id is not None:
+        conditions.append(models.ProductionLog.shift_id == shift_id)
+    if worker_id is not None:
+        conditions.append(models.ProductionLog.worker_id == worker_id)
+    if position_id is not None:
+        conditions.append(models.ProductionLog.position_id == position_id)
+    if sub_position_id is not None:
+        conditions.append(models.ProductionLog.sub_position_id == sub_position_id)
+    if item_id is not None:
+        conditions.append(models.ProductionLog.item_id == item_id)
+    # NULL means "not reviewed yet", so a false filter has to match it as well
+    if approved_coordinator is not None:
+        conditions.append(
+            models.ProductionLog.approved_coordinator.is_(True) if approved_coordinator
+            else models.ProductionLog.approved_coordinator.isnot(True)
+        )
+    if approved_spv is not None:
+        conditions.append(
+            models.ProductionLog.approved_spv.is_(True) if approved_spv
+            else models.ProductionLog.approved_spv.isnot(True)
+        )
+    if status_completion is not None:
+        conditions.append(models.ProductionLog.status_completion == status_completion)
+    return conditions
+
+
+# Limits of the Numeric(10, 2) quantity and Integer columns of production_logs
+MAX_QTY = 10 ** 8
+MIN_INT, MAX_INT = -2 ** 31, 2 ** 31 - 1
+
+
+def _log_fk_checks(data, problem_comment_ids: list[int], approvers: bool = False) -> list:
+    """Foreign key checks shared by ProductionLogCreate and ProductionLogUpdate payloads
+
+    In the order the errors are reported; approvers=True adds the approver checks
+    of ProductionLogUpdate ahead of the problem comments.
+    """
+    checks = [
+        (models.Worker, data.worker_id, "Worker tidak ditemukan"),
+        (models.Position, data.position_id, "Position tidak ditemukan"),
+        (models.SubPosition, data.sub_position_id, "Sub position tidak ditemukan"),
+        (models.Shift, data.shift_id, "Shift tidak ditemukan"),
+        (models.Supplier, data.supplier_id, "Supplier tidak ditemukan"),
+        (models.Item, data.item_id, "Item tidak ditemukan"),
+    ]
+    if approvers:
+        checks += [
+            (models.Worker, data.approved_coordinator_by, "Approver coordinator tidak ditemukan"),
+            (models.Worker, data.approved_spv_by, "Approver SPV tidak ditemukan"),
+        ]
+    return checks + [
+        (models.ProblemComment, pc_id, f"Problem comment dengan ID {pc_id} tidak ditemukan")
+        for pc_id in problem_comment_ids
+    ]
+
+
+def _log_value_error(data: schemas.ProductionLogCreate) -> str | None:
+    """Mirror the production_logs CHECK constraints and column ranges so one bad row cannot abort a bulk insert"""
+    for field in ("qty_output", "qty_reject"):
+        value = getattr(data, field)
+        if value < 0:
+            return f"{field} tidak boleh negatif"
+        # Numeric(10, 2) holds 8 digits before the decimal point, after rounding to cents
+        if not math.isfinite(value) or round(value, 2) >= MAX_QTY:
+            return f"{field} harus kurang dari {MAX_QTY}"
+    if data.problem_duration_minutes is not None and data.problem_duration_minutes < 0:
+        return "problem_duration_minutes tidak boleh negatif"
+    for field in ("problem_duration_minutes", "status_completion"):
+        value = getattr(data, field)
+        if value is not None and not MIN_INT <= value <= MAX_INT:
+            return f"{field} di luar jangkauan"
+    return None
+
+
+# Columns ProductionLogUpdate may leave out but not set to null
+NOT_NULL_LOG_FIELDS = ("worker_id", "position_id", "shift_id", "item_id", "qty_output", "qty_reject", "created_at")
+
+
+def _id_in(log_ids: List[int]):
+    """production_logs.id = ANY(:ids) bound as one array parameter, whatever the list length"""
+    return models.ProductionLog.id == any_(literal(list(set(log_ids)), ARRAY(BigInteger)))
+
+
+def _export_statement(filters: list):
+    """Flat, denormalized SELECT used by the export endpoint"""
+    log = models.ProductionLog
+    coordinator = aliased(models.Worker)
+    spv = aliased(models.Worker)
+    problem_comments = select(func.string_agg(models.ProblemComment.description, "; "))\
+        .join(models.ProductionLogProblemComment, models.ProductionLogProblemComment.problem_comment_id == models.ProblemComment.id)\
+        .where(models.ProductionLogProblemComment.production_log_id == log.id)\
+        .correlate(log)\
+        .scalar_subquery()
+
+    return select(
+        log.id,
+        log.created_at,
+        models.Shift.name.label("shift"),
+        log.worker_id,
+        models.Worker.name.label("worker_name"),
+        models.Department.name.label("department"),
+        models.Position.code.label("position"),
+        models.SubPosition.code.label("sub_position"),
+        models.Item.item_number,
+        models.Item.item_name,
+        models.Supplier.name.label("supplier"),
+        log.qty_output,
+        log.qty_reject,
+        log.problem_duration_minutes,
+        log.status_completion,
+        problem_comments.label("problem_comments"),
+        log.approved_coordinator,
+        log.approved_coordinator_at,
+        coordinator.name.label("approved_coordinator_by"),
+        log.approved_spv,
+        log.approved_spv_at,
+        spv.name.label("approved_spv_by"),
+    )\
+        .join(models.Worker, log.worker_id == models.Worker.id)\
+        .join(models.Position, log.position_id == models.Position.id)\
+        .join(models.Shift, log.shift_id == models.Shift.id)\
+        .join(models.Item, log.item_id == models.Item.id)\
+        .outerjoin(models.Department, models.Worker.department_id == models.Department.id)\
+        .outerjoin(models.SubPosition, log.sub_position_id == models.SubPosition.id)\
+        .outerjoin(models.Supplier, log.supplier_id == models.Supplier.id)\
+        .outerjoin(coordinator, log.approved_coordinator_by == coordinator.id)\
+        .outerjoin(spv, log.approved_spv_by == spv.id)\
+        .where(*filters)\
+        .order_by(log.created_at, log.id)
+
+
+def _stream_rows(statement, session_factory: sessionmaker):
+    """Yield chunks of rows from a server-side cursor on a dedicated session
+
+    The request-scoped session may already be closed while the response is still
+    streaming, so the generator owns its own.
+    """
+    db = session_factory()
+    try:
+        result = db.execute(statement, execution_options={"stream_results": True, "yield_per": EXPORT_CHUNK_SIZE})
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+
+def _stream_csv(statement, session_factory: sessionmaker):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(statement.selected_columns.keys())
+    for rows in _stream_rows(statement, session_factory):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Header only, when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _stream_ndjson(statement, session_factory: sessionmaker):
+    columns = statement.selected_columns.keys()
+    for rows in _stream_rows(statement, session_factory):
+        yield "".join(json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _encode_cursor(log: models.ProductionLog) -> str:
+    """Build an opaque cursor pointing just after the given log"""
+    raw = json.dumps({"created_at": log.created_at.isoformat(), "id": log.id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor produced by _encode_cursor"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(data["created_at"]), int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor tidak valid")
+
 
 def _format_production_log_response(log: models.ProductionLog) -> schemas.ProductionLogResponse:
     """Helper function to format production log with problem_comments extracted"""
@@ -49,44 +288,110 @@ def _format_production_log_response(log: models.ProductionLog) -> schemas.Produc
     return schemas.ProductionLogResponse.model_validate(log_dict)
 
 
-@router.get("", response_model=list[schemas.ProductionLogResponse])
-@router.get("/", response_model=list[schemas.ProductionLogResponse])
-def get_logs(db: Session = Depends(get_db)):
-    """Get all production logs with all related data"""
-    logs = db.query(models.ProductionLog)\
-        .options(
-            joinedload(models.ProductionLog.worker).joinedload(models.Worker.position),
-            joinedload(models.ProductionLog.worker).joinedload(models.Worker.department).joinedload(models.Department.division),
-            joinedload(models.ProductionLog.position),
-            joinedload(models.ProductionLog.sub_position).joinedload(models.SubPosition.position),
-            joinedload(models.ProductionLog.shift),
-            joinedload(models.ProductionLog.supplier),
-            joinedload(models.ProductionLog.item),
-            joinedload(models.ProductionLog.approved_coordinator_by_worker),
-            joinedload(models.ProductionLog.approved_spv_by_worker),
-            selectinload(models.ProductionLog.production_log_problem_comments).joinedload(models.ProductionLogProblemComment.problem_comment)
-        )\
+@router.get("", response_model=schemas.ProductionLogPage | list[schemas.ProductionLogResponse])
+@router.get("/", response_model=schemas.ProductionLogPage | list[schemas.ProductionLogResponse])
+def get_logs(
+    filters: list = Depends(_log_filters),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    unpaginated: bool = Query(default=False, alias="all", description="Return every log as a plain list (legacy clients)"),
+    db: Session = Depends(get_read_db),
+):
+    """Get production logs, newest first, paginated by (created_at, id) keyset cursor"""
+    query = _with_relations(db.query(models.ProductionLog)).filter(*filters)
+
+    if unpaginated:
+        return [_format_production_log_response(log) for log in query.all()]
+
+    if cursor is not None:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        query = query.filter(
+            tuple_(models.ProductionLog.created_at, models.ProductionLog.id) < (cursor_created_at, cursor_id)
+        )
+
+    logs = query\
+        .order_by(models.ProductionLog.created_at.desc(), models.ProductionLog.id.desc())\
+        .limit(limit + 1)\
         .all()
-    return [_format_production_log_response(log) for log in logs]
+
+    # One extra row tells us whether another page exists without a COUNT query
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = _encode_cursor(logs[-1])
+
+    return schemas.ProductionLogPage(
+        items=[_format_production_log_response(log) for log in logs],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/export")
+@router.get("/export/")
+def export_logs(
+    filters: list = Depends(_log_filters),
+    export_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format"),
+    session_factory: sessionmaker = Depends(read_sessionmaker),
+):
+    """Stream production logs as flat CSV or NDJSON rows, oldest first
+
+    Rows are read through a server-side cursor and written chunk by chunk, so memory
+    use does not depend on how many logs match the filters.
+    """
+    statement = _export_statement(filters)
+    if export_format == "csv":
+        return StreamingResponse(
+            _stream_csv(statement, session_factory),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="production_logs.csv"'}
+        )
+    return StreamingResponse(_stream_ndjson(statement, session_factory), media_type="application/x-ndjson")
+
+
+def _feed_filter(shift_id: int | None, position_id: int | None, department_id: int | None):
+    """Event filter for the live feed; every given ID must match"""
+    wanted = {"shift_id": shift_id, "position_id": position_id, "department_id": department_id}
+    wanted = {field: value for field, value in wanted.items() if value is not None}
+    return lambda event_type, data: all(data.get(field) == value for field, value in wanted.items())
+
+
+@router.get("/events")
+@router.get("/events/")
+async def stream_log_events(
+    shift_id: int | None = Query(default=None),
+    position_id: int | None = Query(default=None),
+    department_id: int | None = Query(default=None),
+):
+    """Server-Sent Events feed of production log changes
+
+    Each event is named after its action (create, update, approve, delete) and carries
+    the log id with its shift, position, sub position, worker, department and approval
+    flags, so clients refetch only the rows they show.
+    """
+    return StreamingResponse(
+        sse_stream(log_events, accept=_feed_filter(shift_id, position_id, department_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def log_events_websocket(
+    websocket: WebSocket,
+    shift_id: int | None = Query(default=None),
+    position_id: int | None = Query(default=None),
+    department_id: int | None = Query(default=None),
+):
+    """WebSocket feed of production log changes, same events and filters as /events"""
+    await websocket.accept()
+    await websocket_stream(websocket, log_events, _feed_filter(shift_id, position_id, department_id))
 
 
 @router.get("/{log_id}", response_model=schemas.ProductionLogResponse)
 @router.get("/{log_id}/", response_model=schemas.ProductionLogResponse)
-def get_log(log_id: int, db: Session = Depends(get_db)):
+def get_log(log_id: int, db: Session = Depends(get_read_db)):
     """Get a production log by ID with all related data"""
-    log = db.query(models.ProductionLog)\
-        .options(
-            joinedload(models.ProductionLog.worker).joinedload(models.Worker.position),
-            joinedload(models.ProductionLog.worker).joinedload(models.Worker.department).joinedload(models.Department.division),
-            joinedload(models.ProductionLog.position),
-            joinedload(models.ProductionLog.sub_position).joinedload(models.SubPosition.position),
-            joinedload(models.ProductionLog.shift),
-            joinedload(models.ProductionLog.supplier),
-            joinedload(models.ProductionLog.item),
-            joinedload(models.ProductionLog.approved_coordinator_by_worker),
-            joinedload(models.ProductionLog.approved_spv_by_worker),
-            selectinload(models.ProductionLog.production_log_problem_comments).joinedload(models.ProductionLogProblemComment.problem_comment)
-        )\
+    log = _with_relations(db.query(models.ProductionLog))\
         .filter(models.ProductionLog.id == log_id)\
         .first()
     if not log:
@@ -98,41 +403,16 @@ def get_log(log_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=schemas.ProductionLogResponse, status_code=201)
 def create_log(data: schemas.ProductionLogCreate, db: Session = Depends(get_db)):
     """Create a new production log"""
-    # Validate all foreign keys
-    if not db.query(models.Worker).filter(models.Worker.id == data.worker_id).first():
-        raise HTTPException(status_code=404, detail="Worker tidak ditemukan")
-
-    if not db.query(models.Position).filter(models.Position.id == data.position_id).first():
-        raise HTTPException(status_code=404, detail="Position tidak ditemukan")
-
-    if data.sub_position_id is not None:
-        if not db.query(models.SubPosition)\
-            .filter(models.SubPosition.id == data.sub_position_id)\
-            .first():
-            raise HTTPException(status_code=404, detail="Sub position tidak ditemukan")
-
-    if not db.query(models.Shift).filter(models.Shift.id == data.shift_id).first():
-        raise HTTPException(status_code=404, detail="Shift tidak ditemukan")
-
-    if data.supplier_id is not None:
-        if not db.query(models.Supplier).filter(models.Supplier.id == data.supplier_id).first():
-            raise HTTPException(status_code=404, detail="Supplier tidak ditemukan")
-
-    if not db.query(models.Item).filter(models.Item.id == data.item_id).first():
-        raise HTTPException(status_code=404, detail="Item tidak ditemukan")
-
-    # Validate problem comments if provided
+    # Validate all foreign keys and problem comments in one query
     problem_comment_ids = data.problem_comment_ids or []
-    if problem_comment_ids:
-        for pc_id in problem_comment_ids:
-            if not db.query(models.ProblemComment).filter(models.ProblemComment.id == pc_id).first():
-                raise HTTPException(status_code=404, detail=f"Problem comment dengan ID {pc_id} tidak ditemukan")
+    validate_foreign_keys(db, _log_fk_checks(data, problem_comment_ids))
 
     # Create production log
     log_data = data.model_dump(exclude={"problem_comment_ids"})
     log = models.ProductionLog(**log_data)
     db.add(log)
-    db.flush()  # Flush to get the ID
+    db.flush()  # Flush to get the ID and server-side created_at
+    apply_rollup_deltas(db, [(rollup_values(log), 1)])
 
     # Create many-to-many relationships
     for pc_id in problem_comment_ids:
@@ -142,80 +422,110 @@ def create_log(data: schemas.ProductionLogCreate, db: Session = Depends(get_db))
         )
         db.add(plpc)
 
+    notify_log_changes(db, "create", [log.id])
     db.commit()
     db.refresh(log)
 
     # Reload with relationships
-    log = db.query(models.ProductionLog)\
-        .options(
-            joinedload(models.ProductionLog.worker).joinedload(models.Worker.position),
-            joinedload(models.ProductionLog.worker).joinedload(models.Worker.department).joinedload(models.Department.division),
-            joinedload(models.ProductionLog.position),
-            joinedload(models.ProductionLog.sub_position).joinedload(models.SubPosition.position),
-            joinedload(models.ProductionLog.shift),
-            joinedload(models.ProductionLog.supplier),
-            joinedload(models.ProductionLog.item),
-            joinedload(models.ProductionLog.approved_coordinator_by_worker),
-            joinedload(models.ProductionLog.approved_spv_by_worker),
-            selectinload(models.ProductionLog.production_log_problem_comments).joinedload(models.ProductionLogProblemComment.problem_comment)
-        )\
+    log = _with_relations(db.query(models.ProductionLog))\
         .filter(models.ProductionLog.id == log.id)\
         .first()
     return _format_production_log_response(log)
 
 
+@router.post("/bulk", response_model=schemas.ProductionLogBulkResult, status_code=201)
+@router.post("/bulk/", response_model=schemas.ProductionLogBulkResult, status_code=201)
+def bulk_create_logs(
+    logs: List[schemas.ProductionLogCreate] = Body(...),
+    mode: Literal["all_or_nothing", "partial"] = Query(default="all_or_nothing"),
+    db: Session = Depends(get_db),
+):
+    """Create many production logs in one transaction
+
+    Every row is validated up front with a single foreign key query. In all_or_nothing
+    mode any invalid row rejects the whole batch; in partial mode the valid rows are
+    inserted and the invalid ones are reported back by index.
+    """
+    if not logs:
+        return schemas.ProductionLogBulkResult(created_ids=[])
+
+    all_checks = [_log_fk_checks(data, data.problem_comment_ids or []) for data in logs]
+    ids_by_model: dict = {}
+    for checks in all_checks:
+        for model, model_id, _ in checks:
+            ids_by_model.setdefault(model, set()).add(model_id)
+    existing = fetch_existing_ids(db, ids_by_model)
+
+    errors = []
+    valid_logs = []
+    for index, (data, checks) in enumerate(zip(logs, all_checks)):
+        detail = _log_value_error(data) or next(
+            (detail for model, model_id, detail in checks if model_id is not None and model_id not in existing[model]),
+            None
+        )
+        if detail is not None:
+            errors.append(schemas.ProductionLogBulkError(index=index, detail=detail))
+        else:
+            valid_logs.append(data)
+
+    if errors and mode == "all_or_nothing":
+        raise HTTPException(status_code=400, detail=[error.model_dump() for error in errors])
+    if not valid_logs:
+        return schemas.ProductionLogBulkResult(created_ids=[], errors=errors)
+
+    # executemany builds one statement from the first row's keys, so every row
+    # needs created_at; rows without one get the time the server default would (now())
+    batch_time = db.execute(select(func.localtimestamp())).scalar_one()
+    rows = []
+    for data in valid_logs:
+        row = data.model_dump(exclude={"problem_comment_ids"})
+        if row["created_at"] is None:
+            row["created_at"] = batch_time
+        rows.append(row)
+
+    created_ids = db.execute(
+        insert(models.ProductionLog).returning(models.ProductionLog.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+    apply_rollup_deltas(db, [(rollup_values(row), 1) for row in rows])
+
+    comment_rows = [
+        {"production_log_id": log_id, "problem_comment_id": pc_id}
+        for log_id, data in zip(created_ids, valid_logs)
+        for pc_id in data.problem_comment_ids or []
+    ]
+    if comment_rows:
+        db.execute(insert(models.ProductionLogProblemComment), comment_rows)
+
+    notify_log_changes(db, "create", created_ids)
+    db.commit()
+    return schemas.ProductionLogBulkResult(created_ids=created_ids, errors=errors)
+
+
 @router.put("/{log_id}", response_model=schemas.ProductionLogResponse)
 @router.put("/{log_id}/", response_model=schemas.ProductionLogResponse)
 def update_log(log_id: int, data: schemas.ProductionLogUpdate, db: Session = Depends(get_db)):
     """Update a production log"""
+    # Lock the row: concurrent edits would otherwise derive their rollup deltas
+    # from the same old values
     log = db.query(models.ProductionLog)\
         .filter(models.ProductionLog.id == log_id)\
+        .with_for_update()\
         .first()
     if not log:
         raise HTTPException(status_code=404, detail="Production log tidak ditemukan")
     
-    # Verify foreign keys if they are being updated
-    if data.worker_id is not None:
-        if not db.query(models.Worker).filter(models.Worker.id == data.worker_id).first():
-            raise HTTPException(status_code=404, detail="Worker tidak ditemukan")
-    
-    if data.position_id is not None:
-        if not db.query(models.Position).filter(models.Position.id == data.position_id).first():
-            raise HTTPException(status_code=404, detail="Position tidak ditemukan")
-    
-    if data.sub_position_id is not None:
-        if not db.query(models.SubPosition).filter(models.SubPosition.id == data.sub_position_id).first():
-            raise HTTPException(status_code=404, detail="Sub position tidak ditemukan")
-    
-    if data.shift_id is not None:
-        if not db.query(models.Shift).filter(models.Shift.id == data.shift_id).first():
-            raise HTTPException(status_code=404, detail="Shift tidak ditemukan")
-    
-    if data.supplier_id is not None:
-        if not db.query(models.Supplier).filter(models.Supplier.id == data.supplier_id).first():
-            raise HTTPException(status_code=404, detail="Supplier tidak ditemukan")
-    
-    if data.item_id is not None:
-        if not db.query(models.Item).filter(models.Item.id == data.item_id).first():
-            raise HTTPException(status_code=404, detail="Item tidak ditemukan")
-    
-    if data.approved_coordinator_by is not None:
-        if not db.query(models.Worker).filter(models.Worker.id == data.approved_coordinator_by).first():
-            raise HTTPException(status_code=404, detail="Approver coordinator tidak ditemukan")
-    
-    if data.approved_spv_by is not None:
-        if not db.query(models.Worker).filter(models.Worker.id == data.approved_spv_by).first():
-            raise HTTPException(status_code=404, detail="Approver SPV tidak ditemukan")
+    previous_rollup = rollup_values(log)
 
-    # Validate problem comments if provided
+    # Verify foreign keys being updated and problem comments in one query
     problem_comment_ids = data.problem_comment_ids
-    if problem_comment_ids is not None:
-        for pc_id in problem_comment_ids:
-            if not db.query(models.ProblemComment).filter(models.ProblemComment.id == pc_id).first():
-                raise HTTPException(status_code=404, detail=f"Problem comment dengan ID {pc_id} tidak ditemukan")
+    validate_foreign_keys(db, _log_fk_checks(data, problem_comment_ids or [], approvers=True))
 
     # Update basic fields
     update_data = data.model_dump(exclude_unset=True, exclude={"problem_comment_ids"})
+    null_fields = [field for field in NOT_NULL_LOG_FIELDS if field in update_data and update_data[field] is None]
+    if null_fields:
+        raise HTTPException(status_code=400, detail=f"{', '.join(null_fields)} tidak boleh null")
     
     # Handle approval timestamps
     if data.approved_coordinator is not None:
@@ -230,6 +540,7 @@ def update_log(log_id: int, data: schemas.ProductionLogUpdate, db: Session = Dep
 
     for field, value in update_data.items():
         setattr(log, field, value)
+    apply_rollup_deltas(db, [(previous_rollup, -1), (rollup_values(log), 1)])
     
     # Update many-to-many relationships if provided
     if problem_comment_ids is not None:
@@ -246,23 +557,13 @@ def update_log(log_id: int, data: schemas.ProductionLogUpdate, db: Session = Dep
             )
             db.add(plpc)
     
+    db.flush()
+    notify_log_changes(db, "update", [log.id])
     db.commit()
     db.refresh(log)
 
     # Reload with relationships
-    log = db.query(models.ProductionLog)\
-        .options(
-            joinedload(models.ProductionLog.worker).joinedload(models.Worker.position),
-            joinedload(models.ProductionLog.worker).joinedload(models.Worker.department).joinedload(models.Department.division),
-            joinedload(models.ProductionLog.position),
-            joinedload(models.ProductionLog.sub_position).joinedload(models.SubPosition.position),
-            joinedload(models.ProductionLog.shift),
-            joinedload(models.ProductionLog.supplier),
-            joinedload(models.ProductionLog.item),
-            joinedload(models.ProductionLog.approved_coordinator_by_worker),
-            joinedload(models.ProductionLog.approved_spv_by_worker),
-            selectinload(models.ProductionLog.production_log_problem_comments).joinedload(models.ProductionLogProblemComment.problem_comment)
-        )\
+    log = _with_relations(db.query(models.ProductionLog))\
         .filter(models.ProductionLog.id == log.id)\
         .first()
     return _format_production_log_response(log)
@@ -272,33 +573,108 @@ def update_log(log_id: int, data: schemas.ProductionLogUpdate, db: Session = Dep
 @router.delete("/{log_id}/")
 def delete_log(log_id: int, db: Session = Depends(get_db)):
     """Delete a production log"""
+    # Lock the row so a concurrent update cannot move the values being subtracted
     log = db.query(models.ProductionLog)\
         .filter(models.ProductionLog.id == log_id)\
+        .with_for_update()\
         .first()
     if not log:
         raise HTTPException(status_code=404, detail="Production log tidak ditemukan")
     
+    apply_rollup_deltas(db, [(rollup_values(log), -1)])
+    notify_log_changes(db, "delete", [log.id])
     db.delete(log)
     db.commit()
     return {"message": "Production log berhasil dihapus"}
 
 
-@router.post("/bulk-increment-status", status_code=200)
-@router.post("/bulk-increment-status/", status_code=200)
+@router.post("/bulk-increment-status", response_model=schemas.ProductionLogBulkIncrementResult, status_code=200)
+@router.post("/bulk-increment-status/", response_model=schemas.ProductionLogBulkIncrementResult, status_code=200)
 def bulk_increment_status(log_ids: List[int] = Body(...), db: Session = Depends(get_db)):
     """Increment status_completion by 1 for the given list of production log IDs"""
     if not log_ids:
-        return {"message": "No IDs provided"}
-        
-    logs = db.query(models.ProductionLog).filter(models.ProductionLog.id.in_(log_ids)).all()
-    
-    if not logs:
+        return schemas.ProductionLogBulkIncrementResult(message="No IDs provided")
+
+    # One set-based UPDATE instead of loading and flushing every log
+    updated = db.execute(
+        update(models.ProductionLog)
+        .where(_id_in(log_ids))
+        .values(status_completion=func.coalesce(models.ProductionLog.status_completion, 0) + 1)
+        .returning(models.ProductionLog.id, models.ProductionLog.status_completion)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    if not updated:
         raise HTTPException(status_code=404, detail="No production logs found for the provided IDs")
 
-    for log in logs:
-        if log.status_completion is None:
-            log.status_completion = 0
-        log.status_completion += 1
-    
+    notify_log_changes(db, "update", [log_id for log_id, _ in updated])
+    db.commit()
+    updated_ids = {log_id for log_id, _ in updated}
+    return schemas.ProductionLogBulkIncrementResult(
+        message=f"Successfully incremented status for {len(updated)} logs",
+        updated=[
+            schemas.ProductionLogStatus(id=log_id, status_completion=status_completion)
+            for log_id, status_completion in updated
+        ],
+        missing_ids=[log_id for log_id in dict.fromkeys(log_ids) if log_id not in updated_ids]
+    )
+
+
+@router.post("/approve", response_model=schemas.ProductionLogApproveResult, status_code=200)
+@router.post("/approve/", response_model=schemas.ProductionLogApproveResult, status_code=200)
+def approve_logs(data: schemas.ProductionLogApprove, db: Session = Depends(get_db)):
+    """Sign off many production logs as coordinator or SPV in one UPDATE"""
+    if not data.log_ids:
+        return schemas.ProductionLogApproveResult(message="No IDs provided")
+
+    log = models.ProductionLog
+    if data.role == "coordinator":
+        approver_detail = "Approver coordinator tidak ditemukan"
+        conditions = [_id_in(data.log_ids)]
+        values = {
+            log.approved_coordinator: True,
+            log.approved_coordinator_by: data.approver_id,
+            log.approved_coordinator_at: func.coalesce(log.approved_coordinator_at, datetime.now()),
+        }
+    else:
+        approver_detail = "Approver SPV tidak ditemukan"
+        # spv_after_coordinator_check: SPV approval needs the coordinator approval first
+        conditions = [_id_in(data.log_ids), log.approved_coordinator.is_(True)]
+        values = {
+            log.approved_spv: True,
+            log.approved_spv_by: data.approver_id,
+            log.approved_spv_at: func.coalesce(log.approved_spv_at, datetime.now()),
+        }
+    validate_foreign_keys(db, [(models.Worker, data.approver_id, approver_detail)])
+
+    approved_ids = set(db.scalars(
+        update(log)
+        .where(*conditions)
+        .values(values)
+        .returning(log.id)
+        .execution_options(synchronize_session=False)
+    ).all())
+
+    # Logs that were not updated either do not exist or are still waiting for the coordinator
+    remaining_ids = [log_id for log_id in data.log_ids if log_id not in approved_ids]
+    existing_ids = set()
+    if remaining_ids and data.role == "spv":
+        existing_ids = set(db.scalars(select(log.id).where(_id_in(remaining_ids))).all())
+
+    notify_log_changes(db, "approve", approved_ids, role=data.role)
     db.commit()
-    return {"message": f"Successfully incremented status for {len(logs)} logs"}
+
+    outcomes = []
+    for log_id in dict.fromkeys(data.log_ids):
+        if log_id in approved_ids:
+            status = "approved"
+        elif log_id in existing_ids:
+            status = "coordinator_pending"
+        else:
+            status = "not_found"
+        outcomes.append(schemas.ProductionLogApprovalOutcome(id=log_id, status=status))
+
+    return schemas.ProductionLogApproveResult(
+        message=f"Successfully approved {len(approved_ids)} logs as {data.role}",
+        outcomes=outcomes
+    )
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.database import get_async_read_db
+from app import models, schemas
+from app.routers.production_log import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+    _decode_cursor, _encode_cursor, _format_production_log_response, _log_filters, _with_relations
+)
+
+# Async read endpoints of app.routers.production_log, used when DB_ASYNC is enabled
+router = APIRouter(prefix="/production-logs", tags=["Production Logs"])
+
+
+def _log_statement():
+    """SELECT of production logs with every relation ProductionLogResponse renders
+
+    On top of _with_relations, the approvers' position and department are loaded too,
+    since nothing may be lazy loaded on the event loop.
+    """
+    log = models.ProductionLog
+    statement = _with_relations(select(log))
+    for approver in (log.approved_coordinator_by_worker, log.approved_spv_by_worker):
+        statement = statement.options(
+            joinedload(approver).joinedload(models.Worker.position),
+            joinedload(approver).joinedload(models.Worker.department).joinedload(models.Department.division),
+        )
+    return statement
+
+
+@router.get("", response_model=schemas.ProductionLogPage | list[schemas.ProductionLogResponse])
+@router.get("/", response_model=schemas.ProductionLogPage | list[schemas.ProductionLogResponse])
+async def get_logs(
+    filters: list = Depends(_log_filters),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    unpaginated: bool = Query(default=False, alias="all", description="Return every log as a plain list (legacy clients)"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Get production logs, newest first, paginated by (created_at, id) keyset cursor"""
+    statement = _log_statement().where(*filters)
+
+    if unpaginated:
+        result = await db.execute(statement)
+        return [_format_production_log_response(log) for log in result.unique().scalars().all()]
+
+    if cursor is not None:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(models.ProductionLog.created_at, models.ProductionLog.id) < (cursor_created_at, cursor_id)
+        )
+
+    result = await db.execute(
+        statement
+        .order_by(models.ProductionLog.created_at.desc(), models.ProductionLog.id.desc())
+        .limit(limit + 1)
+    )
+    logs = result.unique().scalars().all()
+
+    # One extra row tells us whether another page exists without a COUNT query
+    next_cursor = None
+    if len(logs) > limit:
+        logs = logs[:limit]
+        next_cursor = _encode_cursor(logs[-1])
+
+    return schemas.ProductionLogPage(
+        items=[_format_production_log_response(log) for log in logs],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/{log_id:int}", response_model=schemas.ProductionLogResponse)
+@router.get("/{log_id:int}/", response_model=schemas.ProductionLogResponse)
+async def get_log(log_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Get a production log by ID with all related data"""
+    result = await db.execute(_log_statement().where(models.ProductionLog.id == log_id))
+    log = result.unique().scalars().first()
+    if not log:
+        raise HTTPException(status_code=404, detail="Production log tidak ditemukan")
+    return _format_production_log_response(log)
@@ -1,16 +1,82 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session, joinedload
-from app.database import get_db
-from app import models, schemas
+from app.database import get_db, get_read_db
+from app import etag, models, schemas
+from app.validators import validate_foreign_keys
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/production-plans", tags=["Production Plans"])
 
-
-@router.get("", response_model=list[schemas.ProductionPlanResponse])
-@router.get("/", response_model=list[schemas.ProductionPlanResponse])
+# Tables behind the GET responses, embedded relations included
+etag_models = (
+    models.ProductionPlan, models.Item, models.Worker, models.Position,
+    models.Department, models.Division, models.Shift, models.SubPosition,
+)
+response_etag = Depends(etag.conditional(*etag_models))
+
+
+def _plan_filters(worker_id, created_by, item_id, position_id, shift_id, sub_position_id) -> list:
+    """SQL conditions for the production plan list filters"""
+    conditions = []
+    if worker_id is not None:
+        conditions.append(models.ProductionPlan.worker_id == worker_id)
+    if created_by is not None:
+        conditions.append(models.ProductionPlan.created_by == created_by)
+    if item_id is not None:
+        conditions.append(models.ProductionPlan.item_id == item_id)
+    if position_id is not None:
+        conditions.append(models.ProductionPlan.position_id == position_id)
+    if shift_id is not None:
+        conditions.append(models.ProductionPlan.shift_id == shift_id)
+    if sub_position_id is not None:
+        conditions.append(models.ProductionPlan.sub_position_id == sub_position_id)
+    return conditions
+
+
+def achievement_statement(conditions: list):
+    """Plan versus actual output per plan, grouped in SQL over production_log_rollups
+
+    A plan matches the rollups of its worker, item and shift on the day it was created;
+    a NULL position or sub position on the plan matches any.
+    """
+    plan = models.ProductionPlan
+    rollup = models.ProductionLogRollup
+    achieved = func.coalesce(func.sum(rollup.qty_output), 0)
+    rejected = func.coalesce(func.sum(rollup.qty_reject), 0)
+
+    return select(
+        plan.id.label("plan_id"),
+        func.date(plan.created_at).label("plan_date"),
+        plan.target,
+        plan.item_id,
+        plan.worker_id,
+        plan.position_id,
+        plan.shift_id,
+        plan.sub_position_id,
+        achieved.label("achieved_qty"),
+        rejected.label("reject_qty"),
+        func.coalesce(func.sum(rollup.log_count), 0).label("log_count"),
+        (rejected * 100 / func.nullif(achieved + rejected, 0)).label("reject_rate_percent"),
+        (achieved * 100 / func.nullif(plan.target, 0)).label("percent_of_target"),
+    )\
+        .outerjoin(rollup, and_(
+            rollup.log_date == func.date(plan.created_at),
+            rollup.worker_id == plan.worker_id,
+            rollup.item_id == plan.item_id,
+            rollup.shift_id == plan.shift_id,
+            or_(plan.position_id.is_(None), rollup.position_id == plan.position_id),
+            or_(plan.sub_position_id.is_(None), rollup.sub_position_id == plan.sub_position_id),
+        ))\
+        .where(*conditions)\
+        .group_by(plan.id)\
+        .order_by(plan.created_at.desc())
+
+
+@router.get("", response_model=list[schemas.ProductionPlanResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.ProductionPlanResponse], dependencies=[response_etag])
 def get_production_plans(
     worker_id: int | None = Query(default=None),
     created_by: int | None = Query(default=None),
@@ -18,7 +84,7 @@ def get_production_plans(
     position_id: int | None = Query(default=None),
     shift_id: int | None = Query(default=None),
     sub_position_id: int | None = Query(default=None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     try:
         query = db.query(models.ProductionPlan).options(
@@ -30,18 +96,7 @@ def get_production_plans(
             joinedload(models.ProductionPlan.created_by_worker),
         )
 
-        if worker_id is not None:
-            query = query.filter(models.ProductionPlan.worker_id == worker_id)
-        if created_by is not None:
-            query = query.filter(models.ProductionPlan.created_by == created_by)
-        if item_id is not None:
-            query = query.filter(models.ProductionPlan.item_id == item_id)
-        if position_id is not None:
-            query = query.filter(models.ProductionPlan.position_id == position_id)
-        if shift_id is not None:
-            query = query.filter(models.ProductionPlan.shift_id == shift_id)
-        if sub_position_id is not None:
-            query = query.filter(models.ProductionPlan.sub_position_id == sub_position_id)
+        query = query.filter(*_plan_filters(worker_id, created_by, item_id, position_id, shift_id, sub_position_id))
 
         return query.order_by(models.ProductionPlan.created_at.desc()).all()
     except Exception as e:
@@ -49,9 +104,25 @@ def get_production_plans(
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
-@router.get("/{plan_id}", response_model=schemas.ProductionPlanResponse)
-@router.get("/{plan_id}/", response_model=schemas.ProductionPlanResponse)
-def get_production_plan(plan_id: int, db: Session = Depends(get_db)):
+@router.get("/achievement", response_model=list[schemas.ProductionPlanAchievement])
+@router.get("/achievement/", response_model=list[schemas.ProductionPlanAchievement])
+def get_production_plan_achievement(
+    worker_id: int | None = Query(default=None),
+    created_by: int | None = Query(default=None),
+    item_id: int | None = Query(default=None),
+    position_id: int | None = Query(default=None),
+    shift_id: int | None = Query(default=None),
+    sub_position_id: int | None = Query(default=None),
+    db: Session = Depends(get_read_db),
+):
+    """Get achieved quantity, reject rate and percent of target for each production plan"""
+    conditions = _plan_filters(worker_id, created_by, item_id, position_id, shift_id, sub_position_id)
+    return db.execute(achievement_statement(conditions)).mappings().all()
+
+
+@router.get("/{plan_id}", response_model=schemas.ProductionPlanResponse, dependencies=[response_etag])
+@router.get("/{plan_id}/", response_model=schemas.ProductionPlanResponse, dependencies=[response_etag])
+def get_production_plan(plan_id: int, db: Session = Depends(get_read_db)):
     plan = (
         db.query(models.ProductionPlan)
         .options(
@@ -74,38 +145,23 @@ def get_production_plan(plan_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=schemas.ProductionPlanResponse, status_code=201)
 def create_production_plan(data: schemas.ProductionPlanCreate, db: Session = Depends(get_db)):
     try:
-        item = db.query(models.Item).filter(models.Item.id == data.item_id).first()
-        if not item:
-            raise HTTPException(status_code=404, detail="Item tidak ditemukan")
-
-        worker = db.query(models.Worker).filter(models.Worker.id == data.worker_id).first()
-        if not worker:
-            raise HTTPException(status_code=404, detail="Worker tidak ditemukan")
-
-        shift = db.query(models.Shift).filter(models.Shift.id == data.shift_id).first()
-        if not shift:
-            raise HTTPException(status_code=404, detail="Shift tidak ditemukan")
-
-        position = None
-        if data.position_id is not None:
-            position = db.query(models.Position).filter(models.Position.id == data.position_id).first()
-            if not position:
-                raise HTTPException(status_code=404, detail="Position tidak ditemukan")
-
-        sub_position = None
-        if data.sub_position_id is not None:
-            sub_position = (
-                db.query(models.SubPosition).filter(models.SubPosition.id == data.sub_position_id).first()
+        validate_foreign_keys(db, [
+            (models.Item, data.item_id, "Item tidak ditemukan"),
+            (models.Worker, data.worker_id, "Worker tidak ditemukan"),
+            (models.Shift, data.shift_id, "Shift tidak ditemukan"),
+            (models.Position, data.position_id, "Position tidak ditemukan"),
+            (models.SubPosition, data.sub_position_id, "Sub Position tidak ditemukan"),
+        ])
+
+        if data.position_id is not None and data.sub_position_id is not None:
+            sub_position_position_id = (
+                db.query(models.SubPosition.position_id).filter(models.SubPosition.id == data.sub_position_id).scalar()
             )
-            if not sub_position:
-                raise HTTPException(status_code=404, detail="Sub Position tidak ditemukan")
+            if sub_position_position_id != data.position_id:
+                raise HTTPException(status_code=400, detail="Sub Position tidak sesuai dengan Position")
 
-        if position is not None and sub_position is not None and sub_position.position_id != position.id:
-            raise HTTPException(status_code=400, detail="Sub Position tidak sesuai dengan Position")
-
-        creator = db.query(models.Worker).filter(models.Worker.id == data.created_by).first()
-        if not creator:
-            raise HTTPException(status_code=404, detail="Created by worker tidak ditemukan")
+        # Checked after the position match, as the mismatch is reported first
+        validate_foreign_keys(db, [(models.Worker, data.created_by, "Created by worker tidak ditemukan")])
 
         plan_data = data.model_dump()
         if plan_data.get("created_at") is None:
@@ -143,34 +199,13 @@ def update_production_plan(plan_id: int, data: schemas.ProductionPlanUpdate, db:
     if not plan:
         raise HTTPException(status_code=404, detail="Production Plan tidak ditemukan")
 
-    if data.item_id is not None:
-        item = db.query(models.Item).filter(models.Item.id == data.item_id).first()
-        if not item:
-            raise HTTPException(status_code=404, detail="Item tidak ditemukan")
-
-    if data.worker_id is not None:
-        worker = db.query(models.Worker).filter(models.Worker.id == data.worker_id).first()
-        if not worker:
-            raise HTTPException(status_code=404, detail="Worker tidak ditemukan")
-
-    position = None
-    if data.position_id is not None:
-        position = db.query(models.Position).filter(models.Position.id == data.position_id).first()
-        if not position:
-            raise HTTPException(status_code=404, detail="Position tidak ditemukan")
-
-    if data.shift_id is not None:
-        shift = db.query(models.Shift).filter(models.Shift.id == data.shift_id).first()
-        if not shift:
-            raise HTTPException(status_code=404, detail="Shift tidak ditemukan")
-
-    sub_position = None
-    if data.sub_position_id is not None:
-        sub_position = (
-            db.query(models.SubPosition).filter(models.SubPosition.id == data.sub_position_id).first()
-        )
-        if not sub_position:
-            raise HTTPException(status_code=404, detail="Sub Position tidak ditemukan")
+    validate_foreign_keys(db, [
+        (models.Item, data.item_id, "Item tidak ditemukan"),
+        (models.Worker, data.worker_id, "Worker tidak ditemukan"),
+        (models.Position, data.position_id, "Position tidak ditemukan"),
+        (models.Shift, data.shift_id, "Shift tidak ditemukan"),
+        (models.SubPosition, data.sub_position_id, "Sub Position tidak ditemukan"),
+    ])
 
     effective_position_id = data.position_id if "position_id" in data.model_fields_set else plan.position_id
     effective_sub_position_id = (
@@ -178,12 +213,11 @@ def update_production_plan(plan_id: int, data: schemas.ProductionPlanUpdate, db:
     )
 
     if effective_position_id is not None and effective_sub_position_id is not None:
-        if sub_position is None:
-            sub_position = (
-                db.query(models.SubPosition).filter(models.SubPosition.id == effective_sub_position_id).first()
-            )
-            if not sub_position:
-                raise HTTPException(status_code=404, detail="Sub Position tidak ditemukan")
+        sub_position = (
+            db.query(models.SubPosition).filter(models.SubPosition.id == effective_sub_position_id).first()
+        )
+        if not sub_position:
+            raise HTTPException(status_code=404, detail="Sub Position tidak ditemukan")
         if sub_position.position_id != effective_position_id:
             raise HTTPException(status_code=400, detail="Sub Position tidak sesuai dengan Position")
 
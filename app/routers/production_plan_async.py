@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.database import get_async_read_db
+from app import etag, models, schemas
+from app.routers.production_plan import _plan_filters, achievement_statement, etag_models
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Async read endpoints of app.routers.production_plan, used when DB_ASYNC is enabled
+router = APIRouter(prefix="/production-plans", tags=["Production Plans"])
+
+response_etag = Depends(etag.conditional_async(*etag_models))
+
+
+def _worker_relations(relationship):
+    return (
+        joinedload(relationship).joinedload(models.Worker.position),
+        joinedload(relationship).joinedload(models.Worker.department).joinedload(models.Department.division),
+    )
+
+
+# Everything ProductionPlanResponse renders; nothing may be lazy loaded on the event loop
+PLAN_RELATIONS = (
+    joinedload(models.ProductionPlan.item),
+    *_worker_relations(models.ProductionPlan.worker),
+    joinedload(models.ProductionPlan.position),
+    joinedload(models.ProductionPlan.shift),
+    joinedload(models.ProductionPlan.sub_position).joinedload(models.SubPosition.position),
+    *_worker_relations(models.ProductionPlan.created_by_worker),
+)
+
+
+@router.get("", response_model=list[schemas.ProductionPlanResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.ProductionPlanResponse], dependencies=[response_etag])
+async def get_production_plans(
+    worker_id: int | None = Query(default=None),
+    created_by: int | None = Query(default=None),
+    item_id: int | None = Query(default=None),
+    position_id: int | None = Query(default=None),
+    shift_id: int | None = Query(default=None),
+    sub_position_id: int | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    try:
+        result = await db.execute(
+            select(models.ProductionPlan)
+            .options(*PLAN_RELATIONS)
+            .where(*_plan_filters(worker_id, created_by, item_id, position_id, shift_id, sub_position_id))
+            .order_by(models.ProductionPlan.created_at.desc())
+        )
+        return result.scalars().all()
+    except Exception as e:
+        logger.error(f"Error fetching production plans: {e}")
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+
+@router.get("/achievement", response_model=list[schemas.ProductionPlanAchievement])
+@router.get("/achievement/", response_model=list[schemas.ProductionPlanAchievement])
+async def get_production_plan_achievement(
+    worker_id: int | None = Query(default=None),
+    created_by: int | None = Query(default=None),
+    item_id: int | None = Query(default=None),
+    position_id: int | None = Query(default=None),
+    shift_id: int | None = Query(default=None),
+    sub_position_id: int | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Get achieved quantity, reject rate and percent of target for each production plan"""
+    conditions = _plan_filters(worker_id, created_by, item_id, position_id, shift_id, sub_position_id)
+    result = await db.execute(achievement_statement(conditions))
+    return result.mappings().all()
+
+
+@router.get("/{plan_id:int}", response_model=schemas.ProductionPlanResponse, dependencies=[response_etag])
+@router.get("/{plan_id:int}/", response_model=schemas.ProductionPlanResponse, dependencies=[response_etag])
+async def get_production_plan(plan_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    result = await db.execute(
+        select(models.ProductionPlan)
+        .options(*PLAN_RELATIONS)
+        .where(models.ProductionPlan.id == plan_id)
+    )
+    plan = result.scalars().first()
+    if not plan:
+        raise HTTPException(status_code=404, detail="Production Plan tidak ditemukan")
+    return plan
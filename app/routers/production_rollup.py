@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import date
+from app.database import get_read_db
+from app import models, schemas
+
+router = APIRouter(prefix="/production-rollups", tags=["Production Rollups"])
+
+
+@router.get("", response_model=list[schemas.ProductionLogRollupResponse])
+@router.get("/", response_model=list[schemas.ProductionLogRollupResponse])
+def get_production_rollups(
+    date_from: date | None = Query(default=None, description="Inclusive"),
+    date_to: date | None = Query(default=None, description="Inclusive"),
+    shift_id: int | None = Query(default=None),
+    position_id: int | None = Query(default=None),
+    sub_position_id: int | None = Query(default=None),
+    item_id: int | None = Query(default=None),
+    worker_id: int | None = Query(default=None),
+    db: Session = Depends(get_read_db),
+):
+    """Get pre-aggregated output, reject, downtime and log count per day/shift/position/item/worker"""
+    query = db.query(models.ProductionLogRollup)
+
+    if date_from is not None:
+        query = query.filter(models.ProductionLogRollup.log_date >= date_from)
+    if date_to is not None:
+        query = query.filter(models.ProductionLogRollup.log_date <= date_to)
+    if shift_id is not None:
+        query = query.filter(models.ProductionLogRollup.shift_id == shift_id)
+    if position_id is not None:
+        query = query.filter(models.ProductionLogRollup.position_id == position_id)
+    if sub_position_id is not None:
+        query = query.filter(models.ProductionLogRollup.sub_position_id == sub_position_id)
+    if item_id is not None:
+        query = query.filter(models.ProductionLogRollup.item_id == item_id)
+    if worker_id is not None:
+        query = query.filter(models.ProductionLogRollup.worker_id == worker_id)
+
+    return query.order_by(
+        models.ProductionLogRollup.log_date.desc(),
+        models.ProductionLogRollup.shift_id,
+        models.ProductionLogRollup.position_id
+    ).all()
@@ -1,14 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
-from app.database import get_db
-from app import models, schemas
+from app.database import get_db, get_read_db
+from app import etag, models, schemas
+from app.validators import validate_foreign_keys
 
 router = APIRouter(prefix="/production-targets", tags=["Production Targets"])
 
+# Tables behind the GET responses, embedded relations included
+response_etag = Depends(etag.conditional(
+    models.ProductionTarget, models.Position, models.SubPosition
+))
 
-@router.get("", response_model=list[schemas.ProductionTargetResponse])
-@router.get("/", response_model=list[schemas.ProductionTargetResponse])
-def get_production_targets(db: Session = Depends(get_db)):
+
+@router.get("", response_model=list[schemas.ProductionTargetResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.ProductionTargetResponse], dependencies=[response_etag])
+def get_production_targets(db: Session = Depends(get_read_db)):
     """Get all production targets"""
     return db.query(models.ProductionTarget)\
         .options(
@@ -18,9 +24,9 @@ def get_production_targets(db: Session = Depends(get_db)):
         .all()
 
 
-@router.get("/{target_id}", response_model=schemas.ProductionTargetResponse)
-@router.get("/{target_id}/", response_model=schemas.ProductionTargetResponse)
-def get_production_target(target_id: int, db: Session = Depends(get_db)):
+@router.get("/{target_id}", response_model=schemas.ProductionTargetResponse, dependencies=[response_etag])
+@router.get("/{target_id}/", response_model=schemas.ProductionTargetResponse, dependencies=[response_etag])
+def get_production_target(target_id: int, db: Session = Depends(get_read_db)):
     """Get a production target by ID"""
     target = db.query(models.ProductionTarget)\
         .options(
@@ -39,17 +45,11 @@ def get_production_target(target_id: int, db: Session = Depends(get_db)):
 def create_production_target(data: schemas.ProductionTargetCreate, db: Session = Depends(get_db)):
     """Create a new production target"""
     try:
-        # Validate position exists if provided
-        if data.position_id is not None:
-            position = db.query(models.Position).filter(models.Position.id == data.position_id).first()
-            if not position:
-                raise HTTPException(status_code=404, detail="Position tidak ditemukan")
-        
-        # Validate sub_position exists if provided
-        if data.sub_position_id is not None:
-            sub_position = db.query(models.SubPosition).filter(models.SubPosition.id == data.sub_position_id).first()
-            if not sub_position:
-                raise HTTPException(status_code=404, detail="Sub Position tidak ditemukan")
+        # Validate position and sub_position exist if provided
+        validate_foreign_keys(db, [
+            (models.Position, data.position_id, "Position tidak ditemukan"),
+            (models.SubPosition, data.sub_position_id, "Sub Position tidak ditemukan"),
+        ])
 
         new_target = models.ProductionTarget(**data.model_dump())
         db.add(new_target)
@@ -78,17 +78,11 @@ def update_production_target(target_id: int, data: schemas.ProductionTargetUpdat
     if not target:
         raise HTTPException(status_code=404, detail="Production Target tidak ditemukan")
     
-    # Validate position exists if provided
-    if data.position_id is not None:
-        position = db.query(models.Position).filter(models.Position.id == data.position_id).first()
-        if not position:
-            raise HTTPException(status_code=404, detail="Position tidak ditemukan")
-            
-    # Validate sub_position exists if provided
-    if data.sub_position_id is not None:
-        sub_position = db.query(models.SubPosition).filter(models.SubPosition.id == data.sub_position_id).first()
-        if not sub_position:
-            raise HTTPException(status_code=404, detail="Sub Position tidak ditemukan")
+    # Validate position and sub_position exist if provided
+    validate_foreign_keys(db, [
+        (models.Position, data.position_id, "Position tidak ditemukan"),
+        (models.SubPosition, data.sub_position_id, "Sub Position tidak ditemukan"),
+    ])
 
     update_data = data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
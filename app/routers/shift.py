@@ -2,20 +2,28 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.database import get_db
-from app import models, schemas
+from app import cache, etag, models, schemas
+from app.log_feed import notify_cascaded_deletes
 
 router = APIRouter(prefix="/shifts", tags=["Shifts"])
 
+# Tables behind the GET responses, embedded relations included. Read from the
+# primary like the cached list they tag.
+response_etag = Depends(etag.conditional(models.Shift, get_session=get_db))
 
-@router.get("", response_model=list[schemas.ShiftResponse])
-@router.get("/", response_model=list[schemas.ShiftResponse])
+
+@router.get("", response_model=list[schemas.ShiftResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.ShiftResponse], dependencies=[response_etag])
 def get_shifts(db: Session = Depends(get_db)):
     """Get all shifts"""
-    return db.query(models.Shift).all()
+    return cache.get("shifts", "list", lambda: [
+        schemas.ShiftResponse.model_validate(shift)
+        for shift in db.query(models.Shift).all()
+    ])
 
 
-@router.get("/{shift_id}", response_model=schemas.ShiftResponse)
-@router.get("/{shift_id}/", response_model=schemas.ShiftResponse)
+@router.get("/{shift_id}", response_model=schemas.ShiftResponse, dependencies=[response_etag])
+@router.get("/{shift_id}/", response_model=schemas.ShiftResponse, dependencies=[response_etag])
 def get_shift(shift_id: int, db: Session = Depends(get_db)):
     """Get a shift by ID"""
     shift = db.query(models.Shift)\
@@ -39,6 +47,7 @@ def create_shift(data: schemas.ShiftCreate, db: Session = Depends(get_db)):
     
     shift = models.Shift(**data.model_dump())
     db.add(shift)
+    cache.invalidate(db, "shifts")
     db.commit()
     db.refresh(shift)
     return shift
@@ -66,6 +75,7 @@ def update_shift(shift_id: int, data: schemas.ShiftUpdate, db: Session = Depends
     for field, value in update_data.items():
         setattr(shift, field, value)
     
+    cache.invalidate(db, "shifts")
     db.commit()
     db.refresh(shift)
     return shift
@@ -81,7 +91,9 @@ def delete_shift(shift_id: int, db: Session = Depends(get_db)):
     if not shift:
         raise HTTPException(status_code=404, detail="Shift tidak ditemukan")
     
+    notify_cascaded_deletes(db, models.ProductionLog.shift_id == shift_id)
     db.delete(shift)
+    cache.invalidate(db, "shifts")
     try:
         db.commit()
     except IntegrityError:
@@ -1,22 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from app.database import get_db
-from app import models, schemas
+from app import cache, etag, models, schemas
+from app.log_feed import notify_cascaded_deletes
 
 router = APIRouter(prefix="/sub-positions", tags=["Sub Positions"])
 
+# Tables behind the GET responses, embedded relations included. Read from the
+# primary like the cached list they tag.
+response_etag = Depends(etag.conditional(models.SubPosition, models.Position, get_session=get_db))
 
-@router.get("", response_model=list[schemas.SubPositionResponse])
-@router.get("/", response_model=list[schemas.SubPositionResponse])
+
+@router.get("", response_model=list[schemas.SubPositionResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.SubPositionResponse], dependencies=[response_etag])
 def get_sub_positions(db: Session = Depends(get_db)):
     """Get all sub positions with their position information"""
-    return db.query(models.SubPosition)\
-        .options(joinedload(models.SubPosition.position))\
-        .all()
+    return cache.get("sub_positions", "list", lambda: [
+        schemas.SubPositionResponse.model_validate(sub_position)
+        for sub_position in db.query(models.SubPosition).options(joinedload(models.SubPosition.position)).all()
+    ])
 
 
-@router.get("/{sub_position_id}", response_model=schemas.SubPositionResponse)
-@router.get("/{sub_position_id}/", response_model=schemas.SubPositionResponse)
+@router.get("/{sub_position_id}", response_model=schemas.SubPositionResponse, dependencies=[response_etag])
+@router.get("/{sub_position_id}/", response_model=schemas.SubPositionResponse, dependencies=[response_etag])
 def get_sub_position(sub_position_id: int, db: Session = Depends(get_db)):
     """Get a sub position by ID with position information"""
     sub_position = db.query(models.SubPosition)\
@@ -28,14 +34,11 @@ def get_sub_position(sub_position_id: int, db: Session = Depends(get_db)):
     return sub_position
 
 
-@router.get("/by-position/{position_id}", response_model=list[schemas.SubPositionResponse])
-@router.get("/by-position/{position_id}/", response_model=list[schemas.SubPositionResponse])
+@router.get("/by-position/{position_id}", response_model=list[schemas.SubPositionResponse], dependencies=[response_etag])
+@router.get("/by-position/{position_id}/", response_model=list[schemas.SubPositionResponse], dependencies=[response_etag])
 def get_by_position(position_id: int, db: Session = Depends(get_db)):
     """Get all sub positions by position ID"""
-    return db.query(models.SubPosition)\
-        .options(joinedload(models.SubPosition.position))\
-        .filter(models.SubPosition.position_id == position_id)\
-        .all()
+    return [sub for sub in get_sub_positions(db) if sub.position_id == position_id]
 
 
 @router.post("", response_model=schemas.SubPositionResponse, status_code=201)
@@ -61,6 +64,7 @@ def create_sub_position(data: schemas.SubPositionCreate, db: Session = Depends(g
     
     sub = models.SubPosition(**data.model_dump())
     db.add(sub)
+    cache.invalidate(db, "sub_positions")
     db.commit()
     db.refresh(sub)
     
@@ -106,6 +110,7 @@ def update_sub_position(sub_position_id: int, data: schemas.SubPositionUpdate, d
     for field, value in update_data.items():
         setattr(sub_position, field, value)
     
+    cache.invalidate(db, "sub_positions")
     db.commit()
     db.refresh(sub_position)
     
@@ -126,7 +131,9 @@ def delete_sub_position(sub_position_id: int, db: Session = Depends(get_db)):
     if not sub_position:
         raise HTTPException(status_code=404, detail="Sub position tidak ditemukan")
     
+    notify_cascaded_deletes(db, models.ProductionLog.sub_position_id == sub_position_id)
     db.delete(sub_position)
+    cache.invalidate(db, "sub_positions")
     try:
         db.commit()
     except IntegrityError:
@@ -2,20 +2,29 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.database import get_db
-from app import models, schemas
+from app import cache, etag, models, schemas
+from app.rollup import subtract_logs
+from app.log_feed import notify_cascaded_deletes
 
 router = APIRouter(prefix="/suppliers", tags=["Suppliers"])
 
+# Tables behind the GET responses, embedded relations included. Read from the
+# primary like the cached list they tag.
+response_etag = Depends(etag.conditional(models.Supplier, get_session=get_db))
 
-@router.get("", response_model=list[schemas.SupplierResponse])
-@router.get("/", response_model=list[schemas.SupplierResponse])
+
+@router.get("", response_model=list[schemas.SupplierResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.SupplierResponse], dependencies=[response_etag])
 def get_suppliers(db: Session = Depends(get_db)):
     """Get all suppliers"""
-    return db.query(models.Supplier).all()
+    return cache.get("suppliers", "list", lambda: [
+        schemas.SupplierResponse.model_validate(supplier)
+        for supplier in db.query(models.Supplier).all()
+    ])
 
 
-@router.get("/{supplier_id}", response_model=schemas.SupplierResponse)
-@router.get("/{supplier_id}/", response_model=schemas.SupplierResponse)
+@router.get("/{supplier_id}", response_model=schemas.SupplierResponse, dependencies=[response_etag])
+@router.get("/{supplier_id}/", response_model=schemas.SupplierResponse, dependencies=[response_etag])
 def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
     """Get a supplier by ID"""
     supplier = db.query(models.Supplier)\
@@ -38,6 +47,7 @@ def create_supplier(data: schemas.SupplierCreate, db: Session = Depends(get_db))
 
     supplier = models.Supplier(**data.model_dump())
     db.add(supplier)
+    cache.invalidate(db, "suppliers")
     db.commit()
     db.refresh(supplier)
     return supplier
@@ -65,6 +75,7 @@ def update_supplier(supplier_id: int, data: schemas.SupplierUpdate, db: Session
     for field, value in update_data.items():
         setattr(supplier, field, value)
     
+    cache.invalidate(db, "suppliers")
     db.commit()
     db.refresh(supplier)
     return supplier
@@ -80,7 +91,11 @@ def delete_supplier(supplier_id: int, db: Session = Depends(get_db)):
     if not supplier:
         raise HTTPException(status_code=404, detail="Supplier tidak ditemukan")
     
+    # The supplier's logs go with it; rollups are not keyed by supplier, so no FK cleans them up
+    subtract_logs(db, models.ProductionLog.supplier_id == supplier_id)
+    notify_cascaded_deletes(db, models.ProductionLog.supplier_id == supplier_id)
     db.delete(supplier)
+    cache.invalidate(db, "suppliers")
     try:
         db.commit()
     except IntegrityError:
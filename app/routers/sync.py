@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app import models
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+# Reference tables mirrored by the shop-floor tablets, tracked by sync_changes_track()
+SYNC_MODELS = {
+    "workers": models.Worker,
+    "positions": models.Position,
+    "sub_positions": models.SubPosition,
+    "items": models.Item,
+    "shifts": models.Shift,
+    "suppliers": models.Supplier,
+    "problem_comments": models.ProblemComment,
+}
+
+# Columns never sent to clients
+EXCLUDED_COLUMNS = {"workers": {"password"}}
+
+
+def _sync_columns(table_name: str) -> list:
+    excluded = EXCLUDED_COLUMNS.get(table_name, set())
+    return [column for column in SYNC_MODELS[table_name].__table__.c if column.name not in excluded]
+
+
+@router.get("")
+@router.get("/")
+def get_changes(since: int = Query(default=0, ge=0), db: Session = Depends(get_db)):
+    """
+    Reference rows inserted, updated or deleted after version `since`
+
+    Pass the returned `version` as `since` on the next call. since=0 (or a version
+    this server never issued) returns a full snapshot with `full` set, in which case
+    the client should replace its local copy instead of merging.
+    """
+    sync = models.SyncChange
+    version = db.scalar(select(func.coalesce(func.max(sync.version), 0)))
+    full = since == 0 or since > version
+
+    changed_ids = {table_name: {"upsert": [], "delete": []} for table_name in SYNC_MODELS}
+    if not full:
+        changes = db.execute(
+            select(sync.table_name, sync.row_id, sync.operation)
+            .where(sync.version > since, sync.version <= version)
+        )
+        for table_name, row_id, operation in changes:
+            if table_name in changed_ids:
+                changed_ids[table_name][operation].append(row_id)
+
+    tables = {}
+    for table_name, model in SYNC_MODELS.items():
+        upserted = []
+        if full or changed_ids[table_name]["upsert"]:
+            statement = select(*_sync_columns(table_name)).order_by(model.id)
+            if not full:
+                statement = statement.where(model.id.in_(changed_ids[table_name]["upsert"]))
+            upserted = db.execute(statement).mappings().all()
+        tables[table_name] = {
+            "upserted": upserted,
+            "deleted": sorted(changed_ids[table_name]["delete"]),
+        }
+
+    return {"version": version, "full": full, "tables": tables}
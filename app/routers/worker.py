@@ -1,12 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from pydantic import BaseModel
-from app.database import get_db
-from app import models, schemas
+from app.database import get_db, get_read_db
+from app import etag, models, schemas
+from app.validators import validate_foreign_keys
 from app.security import hash_password, verify_password
+from app.log_feed import notify_cascaded_deletes
 
 router = APIRouter(prefix="/workers", tags=["Workers"])
 
+# Tables behind the GET responses, embedded relations included
+etag_models = (
+    models.Worker, models.Position, models.Department, models.Division,
+)
+response_etag = Depends(etag.conditional(*etag_models))
+
 
 class WorkerLogin(BaseModel):
     worker_id: int
@@ -38,9 +46,9 @@ def login_worker(login_data: WorkerLogin, db: Session = Depends(get_db)):
     return worker
 
 
-@router.get("", response_model=list[schemas.WorkerResponse])
-@router.get("/", response_model=list[schemas.WorkerResponse])
-def get_workers(db: Session = Depends(get_db)):
+@router.get("", response_model=list[schemas.WorkerResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.WorkerResponse], dependencies=[response_etag])
+def get_workers(db: Session = Depends(get_read_db)):
     """Get all workers with their position and department information"""
     return db.query(models.Worker)\
         .options(
@@ -50,9 +58,9 @@ def get_workers(db: Session = Depends(get_db)):
         .all()
 
 
-@router.get("/{worker_id}", response_model=schemas.WorkerResponse)
-@router.get("/{worker_id}/", response_model=schemas.WorkerResponse)
-def get_worker(worker_id: int, db: Session = Depends(get_db)):
+@router.get("/{worker_id}", response_model=schemas.WorkerResponse, dependencies=[response_etag])
+@router.get("/{worker_id}/", response_model=schemas.WorkerResponse, dependencies=[response_etag])
+def get_worker(worker_id: int, db: Session = Depends(get_read_db)):
     """Get a worker by ID with their position and department information"""
     worker = db.query(models.Worker)\
         .options(
@@ -71,17 +79,11 @@ def get_worker(worker_id: int, db: Session = Depends(get_db)):
 def create_worker(data: schemas.WorkerCreate, db: Session = Depends(get_db)):
     """Create a new worker"""
     try:
-        # Validate position exists if provided
-        if data.position_id is not None:
-            position = db.query(models.Position).filter(models.Position.id == data.position_id).first()
-            if not position:
-                raise HTTPException(status_code=404, detail="Position tidak ditemukan")
-        
-        # Validate department exists if provided
-        if data.department_id is not None:
-            department = db.query(models.Department).filter(models.Department.id == data.department_id).first()
-            if not department:
-                raise HTTPException(status_code=404, detail="Department tidak ditemukan")
+        # Validate position and department exist if provided
+        validate_foreign_keys(db, [
+            (models.Position, data.position_id, "Position tidak ditemukan"),
+            (models.Department, data.department_id, "Department tidak ditemukan"),
+        ])
         
         # Prepare worker data
         worker_data = data.model_dump()
@@ -125,17 +127,11 @@ def update_worker(worker_id: int, data: schemas.WorkerUpdate, db: Session = Depe
     if not worker:
         raise HTTPException(status_code=404, detail="Worker tidak ditemukan")
     
-    # Validate position exists if position_id is being updated
-    if data.position_id is not None:
-        position = db.query(models.Position).filter(models.Position.id == data.position_id).first()
-        if not position:
-            raise HTTPException(status_code=404, detail="Position tidak ditemukan")
-    
-    # Validate department exists if department_id is being updated
-    if data.department_id is not None:
-        department = db.query(models.Department).filter(models.Department.id == data.department_id).first()
-        if not department:
-            raise HTTPException(status_code=404, detail="Department tidak ditemukan")
+    # Validate position and department exist if they are being updated
+    validate_foreign_keys(db, [
+        (models.Position, data.position_id, "Position tidak ditemukan"),
+        (models.Department, data.department_id, "Department tidak ditemukan"),
+    ])
     
     update_data = data.model_dump(exclude_unset=True)
     
@@ -176,6 +172,7 @@ def delete_worker(worker_id: int, db: Session = Depends(get_db)):
         db.query(models.ProductionLog).filter(models.ProductionLog.approved_coordinator_by == worker_id).update({models.ProductionLog.approved_coordinator_by: None})
         db.query(models.ProductionLog).filter(models.ProductionLog.approved_spv_by == worker_id).update({models.ProductionLog.approved_spv_by: None})
         
+        notify_cascaded_deletes(db, models.ProductionLog.worker_id == worker_id)
         db.delete(worker)
         db.commit()
         return {"message": "Worker berhasil dihapus"}
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.database import get_async_read_db
+from app import etag, models, schemas
+from app.routers.worker import etag_models
+
+# Async read endpoints of app.routers.worker, used when DB_ASYNC is enabled
+router = APIRouter(prefix="/workers", tags=["Workers"])
+
+response_etag = Depends(etag.conditional_async(*etag_models))
+
+# Everything WorkerResponse renders; nothing may be lazy loaded on the event loop
+WORKER_RELATIONS = (
+    joinedload(models.Worker.position),
+    joinedload(models.Worker.department).joinedload(models.Department.division),
+)
+
+
+@router.get("", response_model=list[schemas.WorkerResponse], dependencies=[response_etag])
+@router.get("/", response_model=list[schemas.WorkerResponse], dependencies=[response_etag])
+async def get_workers(db: AsyncSession = Depends(get_async_read_db)):
+    """Get all workers with their position and department information"""
+    result = await db.execute(select(models.Worker).options(*WORKER_RELATIONS))
+    return result.scalars().all()
+
+
+@router.get("/{worker_id:int}", response_model=schemas.WorkerResponse, dependencies=[response_etag])
+@router.get("/{worker_id:int}/", response_model=schemas.WorkerResponse, dependencies=[response_etag])
+async def get_worker(worker_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Get a worker by ID with their position and department information"""
+    result = await db.execute(
+        select(models.Worker)
+        .options(*WORKER_RELATIONS)
+        .where(models.Worker.id == worker_id)
+    )
+    worker = result.scalars().first()
+    if not worker:
+        raise HTTPException(status_code=404, detail="Worker tidak ditemukan")
+    return worker
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime, date as date_type, time as time_type
 from app.models import AttendanceStatus
 
@@ -259,6 +259,66 @@ class ProductionLogResponse(BaseModel):
         from_attributes = True
 
 
+class ProductionLogPage(BaseModel):
+    items: List[ProductionLogResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to fetch the next page
+
+
+class ProductionLogBulkError(BaseModel):
+    index: int  # Position of the rejected row in the request body
+    detail: str
+
+
+class ProductionLogBulkResult(BaseModel):
+    created_ids: List[int]
+    errors: List[ProductionLogBulkError] = []
+
+
+class ProductionLogStatus(BaseModel):
+    id: int
+    status_completion: int
+
+
+class ProductionLogBulkIncrementResult(BaseModel):
+    message: str
+    updated: List[ProductionLogStatus] = []
+    missing_ids: List[int] = []
+
+
+class ProductionLogApprove(BaseModel):
+    log_ids: List[int]
+    role: Literal["coordinator", "spv"]
+    approver_id: int
+
+
+class ProductionLogApprovalOutcome(BaseModel):
+    id: int
+    # approved, not_found, or coordinator_pending (SPV cannot sign off before the coordinator)
+    status: Literal["approved", "not_found", "coordinator_pending"]
+
+
+class ProductionLogApproveResult(BaseModel):
+    message: str
+    outcomes: List[ProductionLogApprovalOutcome] = []
+
+
+# ========= PRODUCTION LOG ROLLUP =========
+class ProductionLogRollupResponse(BaseModel):
+    log_date: date_type
+    shift_id: int
+    position_id: int
+    sub_position_id: Optional[int] = None
+    item_id: int
+    worker_id: int
+    qty_output: float
+    qty_reject: float
+    problem_duration_minutes: int
+    log_count: int
+
+    class Config:
+        from_attributes = True
+
+
 # ========= PRODUCTION TARGET =========
 class ProductionTargetCreate(BaseModel):
     target: float
@@ -331,6 +391,22 @@ class ProductionPlanResponse(BaseModel):
         from_attributes = True
 
 
+class ProductionPlanAchievement(BaseModel):
+    plan_id: int
+    plan_date: date_type
+    target: float
+    item_id: int
+    worker_id: int
+    position_id: Optional[int] = None
+    shift_id: int
+    sub_position_id: Optional[int] = None
+    achieved_qty: float
+    reject_qty: float
+    log_count: int
+    reject_rate_percent: Optional[float] = None  # reject / (output + reject); None when nothing was logged
+    percent_of_target: Optional[float] = None  # None when the target is 0
+
+
 # ========= ATTENDANCE =========
 class AttendanceCreate(BaseModel):
     worker_id: int
@@ -360,3 +436,31 @@ class AttendanceResponse(AttendanceCreate):
 
     class Config:
         from_attributes = True
+
+
+# ========= DEVICE =========
+class DeviceCreate(BaseModel):
+    name: str
+    host: str
+    port: int
+    group: str
+    probe_interval_seconds: Optional[int] = None
+    probe_timeout_seconds: Optional[float] = None
+    is_active: bool = True
+
+
+class DeviceUpdate(BaseModel):
+    name: Optional[str] = None
+    host: Optional[str] = None
+    port: Optional[int] = None
+    group: Optional[str] = None
+    probe_interval_seconds: Optional[int] = None
+    probe_timeout_seconds: Optional[float] = None
+    is_active: Optional[bool] = None
+
+
+class DeviceResponse(DeviceCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,268 @@
+"""
+Background sampler for the /system/status snapshot and /system/history series
+
+psutil calls (CPU percent, process table walk, disk usage) are slow or blocking,
+so they run in a worker thread on a fixed interval and the endpoints only read
+the latest snapshot and the ring buffers kept in memory.
+"""
+import os
+import math
+import time
+import asyncio
+import logging
+import platform
+from array import array
+from datetime import timedelta
+from typing import Optional
+import psutil
+from app.events import monitor_events
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = float(os.getenv("SYSTEM_SAMPLE_INTERVAL", "5"))
+
+# Process names reported in the "services" section
+WATCHED_SERVICES = ("nginx", "postgres")
+
+# (bucket seconds, retention seconds) of each history resolution, finest first
+HISTORY_TIERS = ((5, 3600), (60, 86400))
+
+METRICS = ("cpu_percent", "memory_percent", "disk_percent")
+
+# A "system" event is published whenever a metric crosses its threshold either way
+ALERT_THRESHOLDS = {
+    "cpu_percent": float(os.getenv("SYSTEM_ALERT_CPU_PERCENT", "90")),
+    "memory_percent": float(os.getenv("SYSTEM_ALERT_MEMORY_PERCENT", "90")),
+    "disk_percent": float(os.getenv("SYSTEM_ALERT_DISK_PERCENT", "90")),
+}
+
+_latest: Optional[dict] = None
+
+
+def get_size(bytes, suffix="B"):
+    """
+    Scale bytes to its proper format
+    e.g:
+        1253656 => '1.20MB'
+        1253656678 => '1.17GB'
+    """
+    factor = 1024
+    for unit in ["", "K", "M", "G", "T", "P"]:
+        if bytes < factor:
+            return f"{bytes:.2f}{unit}{suffix}"
+        bytes /= factor
+
+
+def sample() -> dict:
+    """
+    Collect a full system snapshot (blocking, run it off the event loop)
+
+    CPU usage is measured since the previous call, so the first sample after
+    startup reads 0.0.
+    """
+    cpu_usage = psutil.cpu_percent(interval=None)
+    cpu_freq = psutil.cpu_freq()
+    svmem = psutil.virtual_memory()
+    disk_usage = psutil.disk_usage('/')
+    uptime = str(timedelta(seconds=time.time() - psutil.boot_time()))
+
+    # Service Checks (Basic process check)
+    services = {name: "stopped" for name in WATCHED_SERVICES}
+    services["fastapi"] = "running"  # Self check
+    for proc in psutil.process_iter(['name']):
+        name = proc.info['name'] or ""
+        for service in WATCHED_SERVICES:
+            if service in name:
+                services[service] = "active"
+
+    return {
+        "system": {
+            "os": f"{platform.system()} {platform.release()}",
+            "cpu": {
+                "usage_percent": cpu_usage,
+                "count_logical": psutil.cpu_count(logical=True),
+                "frequency_current": f"{cpu_freq.current:.2f}Mhz" if cpu_freq else "N/A"
+            },
+            "memory": {
+                "total": get_size(svmem.total),
+                "available": get_size(svmem.available),
+                "used": get_size(svmem.used),
+                "percent": svmem.percent,
+                "used_gb": round(svmem.used / (1024**3), 2),
+                "total_gb": round(svmem.total / (1024**3), 2)
+            },
+            "disk_root": {
+                "total": get_size(disk_usage.total),
+                "used": get_size(disk_usage.used),
+                "free": get_size(disk_usage.free),
+                "percent": disk_usage.percent,
+                "free_gb": round(disk_usage.free / (1024**3), 2)
+            },
+            "uptime": uptime
+        },
+        "services": services,
+        "sampled_at": time.time()
+    }
+
+
+class MetricHistory:
+    """
+    Fixed-size ring buffer of per-bucket averages at one resolution
+
+    Every series is an array('d') of capacity slots, and bucket n lives in slot
+    n % capacity, so the footprint never grows and stale slots are recognised by
+    their timestamp. Service states are stored as the fraction of samples in the
+    bucket where the service was up.
+    """
+
+    def __init__(self, resolution: int, retention: int, names: tuple):
+        self.resolution = resolution
+        self.retention = retention
+        self.capacity = retention // resolution
+        self.names = names
+        self.timestamps = array('d', [math.nan]) * self.capacity
+        self.values = {name: array('d', [0.0]) * self.capacity for name in names}
+        self._bucket: Optional[int] = None
+        self._sums = dict.fromkeys(names, 0.0)
+        self._count = 0
+
+    def add(self, timestamp: float, sample: dict):
+        bucket = int(timestamp // self.resolution)
+        if self._bucket is not None and bucket != self._bucket:
+            self._flush()
+        self._bucket = bucket
+        for name in self.names:
+            self._sums[name] += sample[name]
+        self._count += 1
+
+    def _flush(self):
+        slot = self._bucket % self.capacity
+        self.timestamps[slot] = self._bucket * self.resolution
+        for name in self.names:
+            self.values[name][slot] = self._sums[name] / self._count
+            self._sums[name] = 0.0
+        self._count = 0
+
+    def points(self, start: float, end: float) -> list[tuple[float, dict]]:
+        """Buckets starting within [start, end], oldest first, including the open bucket"""
+        points = [
+            (timestamp, {name: self.values[name][slot] for name in self.names})
+            for slot, timestamp in enumerate(self.timestamps)
+            if start <= timestamp <= end
+        ]
+        points.sort(key=lambda point: point[0])
+        if self._count and start <= self._bucket * self.resolution <= end:
+            points.append((
+                self._bucket * self.resolution,
+                {name: self._sums[name] / self._count for name in self.names}
+            ))
+        return points
+
+
+_histories = [
+    MetricHistory(resolution, retention, METRICS + WATCHED_SERVICES)
+    for resolution, retention in HISTORY_TIERS
+]
+
+
+def _metrics(snapshot: dict) -> dict:
+    system = snapshot["system"]
+    return {
+        "cpu_percent": system["cpu"]["usage_percent"],
+        "memory_percent": system["memory"]["percent"],
+        "disk_percent": system["disk_root"]["percent"],
+    }
+
+
+def _record(snapshot: dict):
+    sample = _metrics(snapshot)
+    for service in WATCHED_SERVICES:
+        sample[service] = 1.0 if snapshot["services"][service] == "active" else 0.0
+    for history in _histories:
+        history.add(snapshot["sampled_at"], sample)
+
+
+def _publish_changes(previous: Optional[dict], snapshot: dict):
+    """Publish threshold crossings and service state changes since the previous sample"""
+    if previous is None:
+        return
+    before, after = _metrics(previous), _metrics(snapshot)
+    for metric, threshold in ALERT_THRESHOLDS.items():
+        was_high, is_high = before[metric] >= threshold, after[metric] >= threshold
+        if was_high != is_high:
+            monitor_events.publish("system", {
+                "metric": metric,
+                "state": "high" if is_high else "normal",
+                "value": after[metric],
+                "threshold": threshold,
+                "sampled_at": snapshot["sampled_at"],
+            })
+    for service, status in snapshot["services"].items():
+        if previous["services"].get(service) != status:
+            monitor_events.publish("service", {
+                "name": service,
+                "status": status,
+                "sampled_at": snapshot["sampled_at"],
+            })
+
+
+def history(window_seconds: int, max_points: int) -> dict:
+    """
+    Series for the last `window_seconds`, from the finest resolution that covers it
+
+    Args:
+        window_seconds: Length of the window ending now
+        max_points: Consecutive buckets are averaged so no series exceeds this length
+
+    Returns:
+        Dict with the resolution used, bucket timestamps and one list per metric
+    """
+    end = time.time()
+    start = end - window_seconds
+    tier = next((h for h in _histories if h.retention >= window_seconds), _histories[-1])
+    points = tier.points(start, end)
+
+    step = max(1, math.ceil(len(points) / max_points))
+    timestamps = []
+    series = {name: [] for name in tier.names}
+    for offset in range(0, len(points), step):
+        chunk = points[offset:offset + step]
+        timestamps.append(chunk[0][0])
+        for name in tier.names:
+            series[name].append(round(sum(values[name] for _, values in chunk) / len(chunk), 2))
+
+    return {
+        "resolution_seconds": tier.resolution * step,
+        "timestamps": timestamps,
+        "metrics": {name: series[name] for name in METRICS},
+        "services": {name: series[name] for name in WATCHED_SERVICES},
+    }
+
+
+def latest_snapshot() -> Optional[dict]:
+    """Most recent snapshot, or None before the first sample completes"""
+    return _latest
+
+
+async def run_sampler(interval: float = SAMPLE_INTERVAL):
+    """
+    Refresh the snapshot every `interval` seconds until cancelled
+
+    Args:
+        interval: Seconds between samples
+    """
+    global _latest
+    # Prime cpu_percent so the first published sample covers a real interval,
+    # and publish that first sample without waiting a full interval
+    psutil.cpu_percent(interval=None)
+    delay = min(interval, 1.0)
+    while True:
+        await asyncio.sleep(delay)
+        delay = interval
+        try:
+            snapshot = await asyncio.to_thread(sample)
+            _record(snapshot)
+            _publish_changes(_latest, snapshot)
+            _latest = snapshot
+        except Exception:
+            logger.exception("System sample failed")
@@ -0,0 +1,68 @@
+"""
+Foreign key existence checks shared by the write endpoints
+"""
+from typing import Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy import String, literal, select, union_all
+from sqlalchemy.orm import Session
+from app import cache
+
+
+def fetch_existing_ids(db: Session, ids_by_model: dict[type, Iterable[Optional[int]]]) -> dict[type, set[int]]:
+    """
+    Look up which of the requested IDs exist, for every model, in a single round trip
+
+    Reference models held by app.cache confirm IDs from their cached ID sets. Any
+    IDs the cache lacks are still queried, since a row created through another
+    process may not have invalidated this one's cache yet.
+
+    Args:
+        db: Database session
+        ids_by_model: Mapping of model class to the IDs to look for (None entries are ignored)
+
+    Returns:
+        Mapping of model class to the subset of IDs that exist
+    """
+    found = {model: set() for model in ids_by_model}
+    models_by_table = {model.__tablename__: model for model in ids_by_model}
+
+    selects = []
+    for model, ids in ids_by_model.items():
+        wanted = {model_id for model_id in ids if model_id is not None}
+        if wanted and model in cache.ENTITY_BY_MODEL:
+            found[model] = wanted & cache.get_ids(db, model)
+            wanted -= found[model]
+        if wanted:
+            selects.append(
+                select(literal(model.__tablename__, String).label("table_name"), model.id)
+                .where(model.id.in_(wanted))
+            )
+    if not selects:
+        return found
+
+    statement = selects[0] if len(selects) == 1 else union_all(*selects)
+    for table_name, model_id in db.execute(statement):
+        found[models_by_table[table_name]].add(model_id)
+    return found
+
+
+def validate_foreign_keys(db: Session, checks: list[tuple[type, Optional[int], str]]) -> None:
+    """
+    Check that every referenced row exists, raising 404 for the first one that does not
+
+    Args:
+        db: Database session
+        checks: (model, id, detail) tuples in the order errors should be reported;
+            checks whose id is None are skipped
+
+    Raises:
+        HTTPException: 404 with the detail of the first missing reference
+    """
+    ids_by_model: dict[type, list[Optional[int]]] = {}
+    for model, model_id, _ in checks:
+        ids_by_model.setdefault(model, []).append(model_id)
+
+    existing = fetch_existing_ids(db, ids_by_model)
+    for model, model_id, detail in checks:
+        if model_id is not None and model_id not in existing[model]:
+            raise HTTPException(status_code=404, detail=detail)
@@ -0,0 +1,141 @@
+"""
+Benchmark GET /production-plans/achievement against a large synthetic dataset.
+
+Usage:
+    python scripts/bench_achievement.py [--logs 1000000] [--plans 20000] [--days 90] [--skip-seed] [--yes]
+
+Seeding appends synthetic production logs and plans to the database pointed to by
+DATABASE_URL (run seed.py first for the reference data), then rebuilds the rollups.
+The grouped rollup query is timed next to the same grouping done over raw
+production_logs, which is what the endpoint would cost without the rollup table.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, func, or_, select, text
+from app.database import SessionLocal
+from app import models
+from app.rollup import rebuild_rollups
+from app.routers.production_plan import achievement_statement
+
+ITEMS_PER_WORKER = 5
+
+
+def seed(db, log_count: int, plan_count: int, days: int):
+    worker_ids = db.scalars(select(models.Worker.id)).all()
+    item_ids = db.scalars(select(models.Item.id)).all()
+    shift_ids = db.scalars(select(models.Shift.id)).all()
+    position_ids = db.scalars(select(models.Position.id)).all()
+    if not (worker_ids and item_ids and shift_ids and position_ids):
+        raise RuntimeError("Reference data missing, run seed.py first")
+
+    params = {
+        "workers": worker_ids, "items": item_ids[:ITEMS_PER_WORKER], "shifts": shift_ids,
+        "positions": position_ids, "days": days, "logs": log_count, "plans": plan_count,
+    }
+    # Each worker sticks to one shift and position and a handful of items, and logs
+    # several entries per item per day, so logs and plans share realistic keys
+    dimensions = """
+        (:workers)[1 + g % cardinality(:workers)],
+        (:positions)[1 + g % cardinality(:workers) % cardinality(:positions)],
+        (:shifts)[1 + g % cardinality(:workers) % cardinality(:shifts)],
+        (:items)[1 + (g / cardinality(:workers)) % cardinality(:items)],
+        date_trunc('day', now()) - (((g / (cardinality(:workers) * cardinality(:items))) % :days) || ' days')::interval
+    """
+    print(f"Seeding {log_count} production logs over {days} days...")
+    db.execute(text(f"""
+        INSERT INTO production_logs
+            (worker_id, position_id, shift_id, item_id, created_at, qty_output, qty_reject, problem_duration_minutes)
+        SELECT {dimensions} + ((g % 480) || ' minutes')::interval, 10 + g % 90, g % 5, g % 20
+        FROM generate_series(1, :logs) g
+    """), params)
+
+    print(f"Seeding {plan_count} production plans...")
+    db.execute(text(f"""
+        INSERT INTO production_plan (worker_id, position_id, shift_id, item_id, created_at, target, created_by)
+        SELECT {dimensions} + interval '1 hour', 500, (:workers)[1]
+        FROM generate_series(1, :plans) g
+    """), params)
+
+    print("Rebuilding rollups...")
+    rows = rebuild_rollups(db)
+    db.commit()
+    db.execute(text("ANALYZE"))
+    print(f"[OK] {rows} rollup rows")
+
+
+def raw_statement(conditions: list):
+    """The achievement grouping done directly over production_logs, for comparison"""
+    plan = models.ProductionPlan
+    log = models.ProductionLog
+    return select(plan.id, func.coalesce(func.sum(log.qty_output), 0), func.coalesce(func.sum(log.qty_reject), 0))\
+        .outerjoin(log, and_(
+            log.created_at >= func.date(plan.created_at),
+            log.created_at < func.date(plan.created_at) + 1,
+            log.worker_id == plan.worker_id,
+            log.item_id == plan.item_id,
+            log.shift_id == plan.shift_id,
+            or_(plan.position_id.is_(None), log.position_id == plan.position_id),
+            or_(plan.sub_position_id.is_(None), log.sub_position_id == plan.sub_position_id),
+        ))\
+        .where(*conditions)\
+        .group_by(plan.id)
+
+
+def measure(db, statement, repeat: int) -> tuple[float, float, int]:
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(db.execute(statement).all())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), min(timings), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the plan achievement query')
+    parser.add_argument('--logs', type=int, default=1_000_000, help='Synthetic production logs to insert')
+    parser.add_argument('--plans', type=int, default=20_000, help='Synthetic production plans to insert')
+    parser.add_argument('--days', type=int, default=90, help='Days of history to spread the data over')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query')
+    parser.add_argument('--skip-seed', action='store_true', help='Benchmark the existing data only')
+    parser.add_argument('--yes', '-y', action='store_true', help='Skip confirmation prompt')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Plan Achievement Benchmark")
+    print("=" * 60)
+
+    db = SessionLocal()
+    try:
+        if not args.skip_seed:
+            if not args.yes and input(f"Insert {args.logs} synthetic logs into this database? (y/n): ").lower() != 'y':
+                return
+            seed(db, args.logs, args.plans, args.days)
+
+        first_worker = db.scalar(select(models.Worker.id).order_by(models.Worker.id).limit(1))
+        cases = {
+            "all plans": [],
+            "one worker": [models.ProductionPlan.worker_id == first_worker],
+        }
+        print(f"\n{'query':<30}{'median ms':>12}{'min ms':>12}{'rows':>10}")
+        for name, conditions in cases.items():
+            for source, statement in (("rollup", achievement_statement(conditions)), ("raw logs", raw_statement(conditions))):
+                median, best, rows = measure(db, statement, args.repeat)
+                print(f"{name + ' / ' + source:<30}{median:>12.1f}{best:>12.1f}{rows:>10}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
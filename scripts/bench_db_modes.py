@@ -0,0 +1,189 @@
+"""
+Compare throughput and latency of the sync and async (DB_ASYNC) database stacks.
+
+Usage:
+    python scripts/bench_db_modes.py [--clients 200] [--duration 20] [--warmup 3] [--port 8799]
+                                     [--request-timeout 60] [--path /production-logs?limit=50 ...]
+                                     [--modes sync async]
+
+For each mode it starts one uvicorn worker with DB_ASYNC set accordingly, runs
+--clients concurrent keep-alive HTTP clients against the given paths (round robin)
+for --duration seconds after a --warmup, stops the server and prints requests per
+second with p50/p99 latency. Requests that get no answer within --request-timeout
+are reported as timeouts, since the percentiles only cover completed ones.
+DATABASE_URL must point at a populated database. The load generator is plain
+asyncio, so it needs nothing beyond the app's requirements.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATHS = ["/production-logs?limit=50", "/workers/1", "/production-plans/1", "/attendances/1"]
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Read one HTTP/1.1 response and return its status code"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status
+
+
+async def client(host: str, port: int, paths: list[str], offset: int, stop_at: float, measure_from: float,
+                 request_timeout: float, latencies: list[float], errors: list[int], timeouts: list[int]):
+    """One keep-alive connection issuing requests back to back until stop_at
+
+    Requests are measured if they start within [measure_from, stop_at).
+    """
+    requests = [f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode() for path in paths]
+    reader = writer = None
+    index = offset
+    while time.monotonic() < stop_at:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.monotonic()
+            writer.write(requests[index % len(requests)])
+            status = await asyncio.wait_for(read_response(reader), request_timeout)
+            finished = time.monotonic()
+            index += 1
+            if started < measure_from:
+                continue
+            if status >= 400:
+                errors.append(status)
+            else:
+                latencies.append(finished - started)
+        except asyncio.TimeoutError:
+            if started >= measure_from:
+                timeouts.append(1)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            if time.monotonic() >= measure_from:
+                errors.append(0)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def run_load(host: str, port: int, paths: list[str], clients: int, warmup: float, duration: float,
+                   request_timeout: float) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    timeouts: list[int] = []
+    measure_from = time.monotonic() + warmup
+    stop_at = measure_from + duration
+    await asyncio.gather(*(
+        client(host, port, paths, offset, stop_at, measure_from, request_timeout, latencies, errors, timeouts)
+        for offset in range(clients)
+    ))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "timeouts": len(timeouts),
+        "rps": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def wait_until_ready(host: str, port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            status = asyncio.run(_probe(host, port))
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError("Server did not start in time")
+
+
+async def _probe(host: str, port: int) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /openapi.json HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    try:
+        return await read_response(reader)
+    finally:
+        writer.close()
+
+
+def bench_mode(mode: str, args) -> dict:
+    env = dict(os.environ, DB_ASYNC="true" if mode == "async" else "false")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", args.host,
+         "--port", str(args.port), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env=env
+    )
+    try:
+        wait_until_ready(args.host, args.port)
+        return asyncio.run(run_load(
+            args.host, args.port, args.path, args.clients, args.warmup, args.duration, args.request_timeout
+        ))
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            # Graceful shutdown waits for requests stuck on the pool; do not wait for them
+            server.kill()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database mode")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--request-timeout", type=float, default=60)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--path", action="append", help="Request path, repeatable")
+    parser.add_argument("--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    args = parser.parse_args()
+    args.path = args.path or DEFAULT_PATHS
+    for path in args.path:
+        if urlsplit(path).scheme:
+            parser.error("--path takes a path such as /workers/1, not a full URL")
+
+    print(f"{args.clients} clients, {args.duration:.0f}s per mode, paths: {', '.join(args.path)}")
+    results = {mode: bench_mode(mode, args) for mode in args.modes}
+
+    print(f"\n{'mode':<6} {'requests':>9} {'errors':>7} {'timeouts':>9} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode, result in results.items():
+        print(f"{mode:<6} {result['requests']:>9} {result['errors']:>7} {result['timeouts']:>9} "
+              f"{result['rps']:>9.1f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
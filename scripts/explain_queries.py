@@ -0,0 +1,149 @@
+"""
+Run EXPLAIN on the queries issued by the routers and fail on sequential scans of large tables.
+
+Usage:
+    python scripts/explain_queries.py [--min-rows 10000] [--no-analyze]
+
+Point DATABASE_URL at a seeded database first; the check only means something
+when the hot tables hold realistic volumes of data.
+"""
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, text, tuple_
+from app.database import engine
+from app import models
+
+
+def get_router_queries():
+    """Statements mirroring what the routers send to the database
+
+    Only selective lookups are listed; unbounded low-cardinality filters (such as
+    every plan of a shift) legitimately read most of the table.
+    """
+    now = datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    log = models.ProductionLog
+    plan = models.ProductionPlan
+    return {
+        "production_logs: first page": select(log)
+            .order_by(log.created_at.desc(), log.id.desc())
+            .limit(51),
+        "production_logs: next page": select(log)
+            .where(tuple_(log.created_at, log.id) < (now, 1000))
+            .order_by(log.created_at.desc(), log.id.desc())
+            .limit(51),
+        "production_logs: today by shift": select(log)
+            .where(log.shift_id == 1, log.created_at >= today, log.created_at < today + timedelta(days=1))
+            .order_by(log.created_at.desc(), log.id.desc())
+            .limit(51),
+        "production_logs: today by shift pending SPV": select(log)
+            .where(log.shift_id == 1, log.created_at >= today, log.approved_spv.isnot(True))
+            .order_by(log.created_at.desc(), log.id.desc())
+            .limit(51),
+        "production_logs: pending coordinator by shift": select(log)
+            .where(log.shift_id == 1, log.approved_coordinator.isnot(True))
+            .order_by(log.created_at.desc(), log.id.desc())
+            .limit(51),
+        "production_logs: by worker": select(log)
+            .where(log.worker_id == 1)
+            .order_by(log.created_at.desc(), log.id.desc())
+            .limit(51),
+        "production_logs: by position and sub position": select(log)
+            .where(log.position_id == 1, log.sub_position_id == 1)
+            .order_by(log.created_at.desc(), log.id.desc())
+            .limit(51),
+        "production_logs: by item": select(log)
+            .where(log.item_id == 1)
+            .order_by(log.created_at.desc(), log.id.desc())
+            .limit(51),
+        "production_logs: unlink approver on worker delete": select(log.id)
+            .where(log.approved_coordinator_by == 1),
+        "production_log_problem_comments: selectinload": select(models.ProductionLogProblemComment)
+            .where(models.ProductionLogProblemComment.production_log_id.in_([1, 2, 3])),
+        "production_log_problem_comments: problem comment in use": select(models.ProductionLogProblemComment.id)
+            .where(models.ProductionLogProblemComment.problem_comment_id == 1)
+            .limit(1),
+        "attendances: by worker and date": select(models.Attendance)
+            .where(models.Attendance.worker_id == 1, models.Attendance.date == today.date()),
+        "attendances: by date": select(models.Attendance)
+            .where(models.Attendance.date == today.date()),
+        "production_plan: by worker": select(plan)
+            .where(plan.worker_id == 1)
+            .order_by(plan.created_at.desc()),
+        "production_plan: by creator": select(plan)
+            .where(plan.created_by == 1)
+            .order_by(plan.created_at.desc()),
+        "production_plan: by item": select(plan)
+            .where(plan.item_id == 1)
+            .order_by(plan.created_at.desc()),
+        "workers: by department": select(models.Worker)
+            .where(models.Worker.department_id == 1),
+        "sub_positions: by position": select(models.SubPosition)
+            .where(models.SubPosition.position_id == 1),
+    }
+
+
+def find_seq_scans(plan_node, found=None):
+    """Collect the relation names of every Seq Scan node in an EXPLAIN JSON plan"""
+    if found is None:
+        found = []
+    if plan_node.get("Node Type") == "Seq Scan":
+        found.append(plan_node.get("Relation Name"))
+    for child in plan_node.get("Plans", []):
+        find_seq_scans(child, found)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EXPLAIN router queries and fail on large sequential scans')
+    parser.add_argument('--min-rows', type=int, default=10000, help='Tables with at least this many rows count as large')
+    parser.add_argument('--no-analyze', action='store_true', help='Skip ANALYZE before explaining')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Router Query Plan Check")
+    print("=" * 60)
+
+    failures = []
+    with engine.connect() as conn:
+        if not args.no_analyze:
+            conn.exec_driver_sql("ANALYZE")
+
+        table_rows = {
+            name: rows for name, rows in conn.execute(
+                text("SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'")
+            )
+        }
+
+        for name, statement in get_router_queries().items():
+            compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+            plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params).scalar()
+            large_scans = [
+                relation for relation in find_seq_scans(plan[0]["Plan"])
+                if table_rows.get(relation, 0) >= args.min_rows
+            ]
+            if large_scans:
+                failures.append(name)
+                print(f"[ERROR] {name}: Seq Scan on {', '.join(large_scans)}")
+            else:
+                print(f"[OK] {name}")
+
+    print()
+    if failures:
+        print(f"[ERROR] {len(failures)} queries scan large tables sequentially")
+        sys.exit(1)
+    print("[OK] No sequential scans on large tables")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Exercise the async device probes against local fake TCP devices.
+
+Usage:
+    python scripts/fake_device_harness.py [--online 300] [--offline 100] [--blackhole 0] [--timeout 2] [--concurrency 100]
+
+Starts --online listening servers on 127.0.0.1, picks --offline ports with nothing
+listening and, optionally, --blackhole devices that never answer, then probes them
+all through app.device_probe and checks every device was classified correctly.
+A blackhole is a listener whose accept queue is already full, so the kernel drops
+further SYNs like an unreachable remote DVR would; those probes take the full
+timeout, which shows the per-probe timeout and the concurrency limit at work.
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import threading
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def free_port() -> int:
+    """A local port with nothing listening on it (once the probe socket is closed)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def blackhole_listener() -> tuple[socket.socket, list[socket.socket]]:
+    """A listener that never accepts, with its backlog filled so new connects hang"""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(0)
+    fillers = []
+    for _ in range(3):
+        filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        filler.setblocking(False)
+        filler.connect_ex(listener.getsockname())
+        fillers.append(filler)
+    time.sleep(0.1)
+    return listener, fillers
+
+
+async def handle(reader, writer):
+    writer.close()
+
+
+async def run(args):
+    from app import device_probe
+
+    servers = [await asyncio.start_server(handle, "127.0.0.1", 0) for _ in range(args.online)]
+    devices = [
+        {"host": "127.0.0.1", "port": server.sockets[0].getsockname()[1], "expected": True}
+        for server in servers
+    ]
+    devices += [{"host": "127.0.0.1", "port": free_port(), "expected": False} for _ in range(args.offline)]
+    blackholes = [blackhole_listener() for _ in range(min(args.blackhole, 1))]
+    devices += [
+        {"host": "127.0.0.1", "port": blackholes[0][0].getsockname()[1], "expected": False}
+        for _ in range(args.blackhole)
+    ]
+
+    threads_before = threading.active_count()
+    start = time.perf_counter()
+    results = await device_probe.probe_devices(devices, args.timeout)
+    elapsed = time.perf_counter() - start
+    threads_after = threading.active_count()
+
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+    for listener, fillers in blackholes:
+        for sock in [listener, *fillers]:
+            sock.close()
+
+    wrong = [
+        device for device, latency_ms in zip(devices, results)
+        if (latency_ms is not None) != device["expected"]
+    ]
+    latencies = sorted(latency_ms for latency_ms in results if latency_ms is not None)
+
+    print(f"Devices probed:   {len(devices)} ({args.online} online, {args.offline} offline, {args.blackhole} blackhole)")
+    print(f"Elapsed:          {elapsed * 1000:.1f} ms")
+    if latencies:
+        print(f"Latency p50/max:  {latencies[len(latencies) // 2]:.2f} / {latencies[-1]:.2f} ms")
+    print(f"Threads:          {threads_before} before, {threads_after} after")
+    print()
+    if wrong:
+        for device in wrong[:10]:
+            print(f"[ERROR] {device['host']}:{device['port']} expected {'online' if device['expected'] else 'offline'}")
+        print(f"[ERROR] {len(wrong)} devices misclassified")
+        return 1
+    print("[OK] All devices classified correctly")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Probe fake local TCP devices')
+    parser.add_argument('--online', type=int, default=300, help='Listening fake devices')
+    parser.add_argument('--offline', type=int, default=100, help='Closed local ports')
+    parser.add_argument('--blackhole', type=int, default=0, help='Unreachable addresses that time out')
+    parser.add_argument('--timeout', type=float, default=2, help='Per-probe timeout in seconds')
+    parser.add_argument('--concurrency', type=int, default=100, help='Maximum probes in flight')
+    args = parser.parse_args()
+
+    # Read by app.device_probe at import time
+    os.environ["DEVICE_PROBE_CONCURRENCY"] = str(args.concurrency)
+
+    print("=" * 60)
+    print("Device Probe Harness")
+    print("=" * 60)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
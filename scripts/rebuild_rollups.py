@@ -0,0 +1,40 @@
+"""
+Recompute production_log_rollups from production_logs.
+
+Usage:
+    python scripts/rebuild_rollups.py
+
+Safe to run while the API is up: the rollup table is locked for the duration of
+the rebuild, so incremental updates simply wait for it to finish.
+"""
+import os
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add app to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.rollup import rebuild_rollups
+
+
+def main():
+    print("Rebuilding production log rollups...")
+    db = SessionLocal()
+    try:
+        count = rebuild_rollups(db)
+        db.commit()
+        print(f"[OK] Wrote {count} rollup rows")
+    except Exception as e:
+        db.rollback()
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()